@@ -2,9 +2,28 @@ import pygame
 import sys
 import math
 import random
-import array
 import os
-import json
+import time
+import argparse
+import struct
+import threading
+from collections import deque
+
+import assets
+import audio
+import fonts
+import inputlog
+import music
+import overlays
+import profiler
+import render
+import simulation
+import terrain
+import voices
+from animation import AnimationAtlas
+from leaderboard import Leaderboard
+
+START_TIME = time.perf_counter()
 
 # --- 1. System Setup ---
 try:
@@ -20,96 +39,51 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
-pygame.init()
-pygame.mixer.init(frequency=44100, size=-16, channels=2)
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Ruins of Sindh")
-clock = pygame.time.Clock()
+RENDER_FPS = 120  # gameplay ticks at simulation.TICK_RATE regardless
+ICON_SIZE = 80
+LEADERBOARD_FILE = "leaderboard.json"
+ASSET_BUDGET_MB = int(os.environ.get("RUINS_ASSET_BUDGET_MB", "128"))  # decoded assets kept around; the rest reload on demand
+# Internal resolution of the scrolling scene as a fraction of the screen; "auto" starts at 1 and
+# steps down RENDER_SCALES while drawing takes longer than RENDER_BUDGET_MS
+RENDER_SCALE = os.environ.get("RUINS_RENDER_SCALE", "1")
+RENDER_SCALES = (1.0, 0.75, 0.5)
+RENDER_BUDGET_MS = 0.75 * 1000 / simulation.TICK_RATE
+
+# FIXED HITBOXES
+L_HIT = pygame.Rect(50, SCREEN_HEIGHT - 150, 100, 100)
+R_HIT = pygame.Rect(180, SCREEN_HEIGHT - 150, 100, 100)
+J_HIT = pygame.Rect(SCREEN_WIDTH - 160, SCREEN_HEIGHT - 160, 120, 120)
 
-# --- 2. Audio Generation ---
+artifact_info = [
+    {"name": "Dancing Girl", "path": "Dancing_Girl.png", "info": "Bronze statuette (2300 BC). It shows high metal-working skill."},
+    {"name": "Priest-King", "path": "King_Priest.png", "info": "A soapstone sculpture representing a powerful leader or deity."},
+    {"name": "Unicorn Seal", "path": "Seal.png", "info": "Used for trade. Features a mythical creature and ancient Indus script."},
+    {"name": "Painted Pottery", "path": "Painted_Pottery.png", "info": "Sturdy red clay pottery with floral and geometric motifs from the Indus Valley."}
+]
+
+artifact_mapping = ["Painted Pottery", "Dancing Girl", "Unicorn Seal", "Priest-King", "Dancing Girl", "Unicorn Seal", "Painted Pottery"]
+
+# --- 2. Asset Helpers ---
 def generate_sfx(kind):
-    sample_rate = 44100
-    if kind == "whoosh": duration, vol = 0.2, 0.05      
-    elif kind == "hit": duration, vol = 0.2, 0.4        
-    elif kind == "pitfall": duration, vol = 0.4, 0.6    
-    elif kind == "pickup": duration, vol = 0.1, 0.2    
-    elif kind == "jump": duration, vol = 0.08, 0.15    
-    elif kind == "click": duration, vol = 0.05, 0.15
-    elif kind == "gameover": duration, vol = 1.5, 0.4  
-    elif kind == "highscore": duration, vol = 1.0, 0.5
-    elif kind == "heartbeat": duration, vol = 0.3, 0.3
-    else: duration, vol = 0.1, 0.2
-    
-    n_samples = int(sample_rate * duration)
-    buf = array.array('h', [0] * n_samples)
-    for i in range(n_samples):
-        t = i / sample_rate
-        env = math.sin(math.pi * (t / duration))
-        if kind == "gameover":
-            val = (math.sin(2 * math.pi * 100 * t) * (1-t/duration)) + random.uniform(-0.1, 0.1)
-        elif kind == "highscore":
-            val = math.sin(2 * math.pi * 880 * t) * math.sin(2 * math.pi * 5 * t)
-        elif kind == "heartbeat":
-            val = math.sin(2 * math.pi * 60 * t) * math.exp(-20 * (t % 0.15))
-        else:
-            val = (math.sin(2 * math.pi * 440 * t) + random.uniform(-0.3, 0.3)) * env
-        buf[i] = int(max(-1.0, min(1.0, val * vol)) * 32767)
-    return pygame.mixer.Sound(buffer=buf)
-
-def generate_mohenjo_theme(speed=1.0):
-    sample_rate = int(44100 * speed)
-    bpm, total_beats = 105, 8
-    beat_len = 60 / bpm
-    total_samples = int(sample_rate * beat_len * total_beats)
-    buf = array.array('h', [0] * total_samples)
-    melody = [196, 0, 233, 261, 196, 0, 311, 293]
-    for i in range(total_samples):
-        t = i / sample_rate
-        beat_idx = int(t / beat_len) % total_beats
-        t_in_beat = t % beat_len
-        drum = (math.sin(2 * math.pi * 60 * t)) * math.exp(-12 * t_in_beat) * (0.5 if beat_idx % 4 == 0 else 0.2)
-        freq = melody[beat_idx]
-        flute = (math.sin(2 * math.pi * freq * t)) * math.sin(math.pi * (t_in_beat / beat_len)) * 0.25 if freq > 0 else 0
-        buf[i] = int(max(-1.0, min(1.0, (drum + flute) * 0.6)) * 32767)
-    return pygame.mixer.Sound(buffer=buf)
-
-sfx = {k: generate_sfx(k) for k in ["whoosh", "hit", "pitfall", "pickup", "jump", "click", "gameover", "highscore", "heartbeat"]}
-current_theme = generate_mohenjo_theme()
-
-# --- 3. Leaderboard ---
-LEADERBOARD_FILE = "leaderboard.json"
-def load_leaderboard():
-    if os.path.exists(LEADERBOARD_FILE):
-        try:
-            with open(LEADERBOARD_FILE, "r") as f: return json.load(f)
-        except: return []
-    return []
-
-def is_new_best(score):
-    lb = load_leaderboard()
-    return not lb or score > lb[0]["score"]
-
-def save_to_leaderboard(name, score):
-    data = load_leaderboard()
-    data.append({"name": name, "score": score})
-    data = sorted(data, key=lambda x: x["score"], reverse=True)[:5]
-    try:
-        with open(LEADERBOARD_FILE, "w") as f: json.dump(data, f)
-    except: pass
+    return pygame.mixer.Sound(buffer=audio.sfx_pcm(kind))
 
-# --- 4. Asset Helpers ---
-def load_properly(path, scale_to_screen=True, force_size=None):
+def load_properly(path, scale_to_screen=True, force_size=None, height=SCREEN_HEIGHT):
     try:
         img = pygame.image.load(resource_path(path)).convert_alpha()
         if force_size: return pygame.transform.scale(img, force_size)
         if scale_to_screen:
-            ratio = SCREEN_HEIGHT / img.get_height()
-            return pygame.transform.scale(img, (int(img.get_width() * ratio), SCREEN_HEIGHT))
+            ratio = height / img.get_height()
+            return pygame.transform.scale(img, (int(img.get_width() * ratio), height))
         return img
     except Exception as e:
         print(f"Error loading {path}: {e}")
         return pygame.Surface((100, 100), pygame.SRCALPHA)
 
+def scaled_width(path, height=SCREEN_HEIGHT):
+    # load_properly(path).get_width() from the PNG header alone, without decoding the image
+    with open(resource_path(path), "rb") as f: w, h = struct.unpack(">II", f.read(24)[16:24])
+    return int(w * (height / h))
+
 def get_frames(sheet, cols):
     frames = []
     fw, fh = sheet.get_width() // cols, sheet.get_height()
@@ -118,360 +92,466 @@ def get_frames(sheet, cols):
         frames.append(f.subsurface(f.get_bounding_rect()))
     return frames
 
-def create_cinematic_vignette():
-    v = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    for i in range(0, 180, 2):
-        alpha = int(max(0, (1 - i/180) * 190))
-        rect_color = (110, 0, 0, alpha)
-        pygame.draw.rect(v, rect_color, (i, i, SCREEN_WIDTH - 2*i, SCREEN_HEIGHT - 2*i), width=2)
-    return v
-
-def draw_text_with_outline(surf, text, font, pos, text_col, shadow_col, thickness=4, center=False, right=False):
-    tw, th = font.size(text)
-    if center: draw_pos = (pos[0] - tw//2, pos[1])
-    elif right: draw_pos = (pos[0] - tw, pos[1])
-    else: draw_pos = pos
-    for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1), (0,-thickness), (0,thickness), (-thickness,0), (thickness,0)]:
-        outline_surf = font.render(text, True, shadow_col)
-        surf.blit(outline_surf, (draw_pos[0] + dx, draw_pos[1] + dy))
-    main_surf = font.render(text, True, text_col)
-    surf.blit(main_surf, draw_pos)
-
-# --- 5. Loading Assets ---
-background = load_properly("Background.png")
-backdrop = load_properly("Backdrop.png")
-floating_guides = load_properly("Floating_Objects.png")
-front_pillars = load_properly("Front_Objects.png")
-arrows_raw = load_properly("Arrows.png")
-raw_pickups = load_properly("Pickups.png")
-start_bg_img = load_properly("start.png", force_size=(SCREEN_WIDTH, SCREEN_HEIGHT))
-game_over_img = load_properly("Game_over.png", force_size=(800, 450))
-full_hp_seal = pygame.transform.scale(load_properly("fullhp.png", False), (60, 60))
-empty_hp_seal = pygame.transform.scale(load_properly("hpdown.png", False), (60, 60))
-
-idle_frames = get_frames(load_properly("Player_Idle.png", False), 6)
-run_frames  = get_frames(load_properly("Player_Run.png", False), 6)
-idle_masks = [pygame.mask.from_surface(f) for f in idle_frames]
-run_masks = [pygame.mask.from_surface(f) for f in run_frames]
-
-ICON_SIZE = 80
-btn_on = pygame.transform.scale(load_properly("music_on.png", False), (ICON_SIZE, ICON_SIZE))
-btn_off = pygame.transform.scale(load_properly("music_off.png", False), (ICON_SIZE, ICON_SIZE))
-btn_quit_icon = pygame.transform.scale(load_properly("Quit.png", False), (ICON_SIZE, ICON_SIZE))
-
-artifact_info = [
-    {"name": "Dancing Girl", "path": "Dancing_Girl.png", "info": "Bronze statuette (2300 BC). It shows high metal-working skill."},
-    {"name": "Priest-King", "path": "King_Priest.png", "info": "A soapstone sculpture representing a powerful leader or deity."},
-    {"name": "Unicorn Seal", "path": "Seal.png", "info": "Used for trade. Features a mythical creature and ancient Indus script."},
-    {"name": "Painted Pottery", "path": "Painted_Pottery.png", "info": "Sturdy red clay pottery with floral and geometric motifs from the Indus Valley."}
-]
-
-for item in artifact_info:
-    raw = load_properly(item["path"], False)
-    item["card_img"] = pygame.transform.scale(raw, (300, 420))
-    item["icon_img"] = pygame.transform.scale(raw, (60, 80))
-
-artifact_mapping = ["Painted Pottery", "Dancing Girl", "Unicorn Seal", "Priest-King", "Dancing Girl", "Unicorn Seal", "Painted Pottery"]
-
 def extract_entities(layer):
+    # Masks and the "active" flag are added by build_level, so the result can be baked
     if layer.get_width() <= 100: return []
     mask = pygame.mask.from_surface(layer)
     rects = mask.get_bounding_rects()
     rects.sort(key=lambda r: r.x)
-    return [{"img": layer.subsurface(r), "rect": r, "mask": pygame.mask.from_surface(layer.subsurface(r)), "active": True, "name": artifact_mapping[i % len(artifact_mapping)]} for i, r in enumerate(rects)]
-
-pickup_objects = extract_entities(raw_pickups)
-arrow_templates = extract_entities(arrows_raw)
-for a in arrow_templates: a["mask"] = pygame.mask.from_surface(a["img"])
-
-# --- 6. Global State & Reset ---
-hp, MAX_HP = 4, 4
-game_state = "MENU"
-paused, music_enabled, show_guide = False, True, False
-camera_x, player_name, name_taken_warning = 0, "", False
-collected_inventory, reading_card = {}, None
-arrows_in_flight, last_spawn_time, heartbeat_timer = [], 0, 0
-loop_count, total_score, is_high_score = 0, 0, False
-level_width = background.get_width()
-is_moving, is_grounded = False, True
-player_x, player_y = 400, 615
-vel_y, gravity = 0, 0.8
-base_jump, base_speed = -16, 8
-player_direction, jumps_left, jump_pressed = 1, 2, False
-anim_idx, anim_timer, invuln_timer = 0, 0, 0
-vignette_surf = create_cinematic_vignette()
-
-# Touch variables
-touch_moving_right = False
-touch_moving_left = False
-
-# FIXED HITBOXES
-L_HIT = pygame.Rect(50, SCREEN_HEIGHT - 150, 100, 100)
-R_HIT = pygame.Rect(180, SCREEN_HEIGHT - 150, 100, 100)
-J_HIT = pygame.Rect(SCREEN_WIDTH - 160, SCREEN_HEIGHT - 160, 120, 120)
+    return [{"img": layer.subsurface(r), "rect": r, "name": artifact_mapping[i % len(artifact_mapping)]} for i, r in enumerate(rects)]
+
+def scaled(path, size):
+    return lambda: pygame.transform.scale(load_properly(path, False), size)
+
+def load_platforms():
+    return terrain.load_heightmap(load_properly("Floating_Objects.png"), resource_path("Floating_Objects.png"))
+
+ASSET_SOURCES = ["Background.png", "Backdrop.png", "Floating_Objects.png", "Front_Objects.png", "arrows.png", "Pickups.png",
+                 "start.png", "Game_over.png", "fullhp.png", "hpdown.png", "Player_Idle.png", "Player_Run.png",
+                 "music_on.png", "music_off.png", "Quit.png"] + [item["path"] for item in artifact_info]
+
+def layer_builders(height):
+    return {"backdrop": lambda: load_properly("Backdrop.png", height=height),
+            "background": lambda: load_properly("Background.png", height=height),
+            "front": lambda: load_properly("Front_Objects.png", height=height)}
+
+LAYERS = ["backdrop", "background", "front"]
+LAYER_SOURCES = ["Backdrop.png", "Background.png", "Front_Objects.png"]
+
+# The full decode/scale/slice path per asset; assets.AssetManager bakes the results and serves them lazily
+ASSET_BUILDERS = {
+    **layer_builders(SCREEN_HEIGHT),
+    "level_width": lambda: scaled_width("Background.png"),  # the simulation's loop length at any render scale
+    "platforms": load_platforms,
+    "arrows": lambda: extract_entities(load_properly("arrows.png")),
+    "pickups": lambda: extract_entities(load_properly("Pickups.png")),
+    "start_bg": lambda: load_properly("start.png", force_size=(SCREEN_WIDTH, SCREEN_HEIGHT)),
+    "game_over": lambda: load_properly("Game_over.png", force_size=(800, 450)),
+    "full_hp_seal": scaled("fullhp.png", (60, 60)),
+    "empty_hp_seal": scaled("hpdown.png", (60, 60)),
+    "idle_frames": lambda: get_frames(load_properly("Player_Idle.png", False), 6),
+    "run_frames": lambda: get_frames(load_properly("Player_Run.png", False), 6),
+    "btn_on": scaled("music_on.png", (ICON_SIZE, ICON_SIZE)),
+    "btn_off": scaled("music_off.png", (ICON_SIZE, ICON_SIZE)),
+    "btn_quit": scaled("Quit.png", (ICON_SIZE, ICON_SIZE)),
+}
+for item in artifact_info:
+    ASSET_BUILDERS["card:" + item["name"]] = scaled(item["path"], (300, 420))
+    ASSET_BUILDERS["icon:" + item["name"]] = scaled(item["path"], (60, 80))
+
+# Loaded before the first frame / streamed in while NAMING is shown; cards load when first opened
+MENU_ASSETS = ["start_bg", "btn_on", "btn_off", "btn_quit"]
+GAMEPLAY_ASSETS = ["platforms", "idle_frames", "run_frames", "arrows", "pickups", "full_hp_seal", "empty_hp_seal",
+                   "game_over", "backdrop", "background", "front"] + ["icon:" + item["name"] for item in artifact_info]
+
+def build_level(get, level_width):
+    # The simulation's view of the gameplay assets; get is AssetManager.get
+    arrows, pickups = get("arrows"), get("pickups")
+    for e in pickups + arrows: e["mask"] = pygame.mask.from_surface(e["img"]); e["active"] = True
+    return simulation.Level(level_width, (SCREEN_WIDTH, SCREEN_HEIGHT), get("platforms"),
+                            AnimationAtlas(get("idle_frames")), AnimationAtlas(get("run_frames")), arrows, pickups)
+
+def read_keys():
+    # (right, left, jump) held this frame
+    k = pygame.key.get_pressed()
+    return (bool(k[pygame.K_RIGHT] or k[pygame.K_d]), bool(k[pygame.K_LEFT] or k[pygame.K_a]), bool(k[pygame.K_SPACE] or k[pygame.K_w]))
+
+
+class Game:
+    # Nothing happens at import: the window, audio and assets come up here, and
+    # run() (or a headless driver) feeds frames through handle_event/update/draw.
+    def __init__(self, seed=None, leaderboard_path=LEADERBOARD_FILE, prof=None, render_scale=None):
+        # An enabled profiler must exist before anything below builds Surfaces, Fonts or Sounds
+        self.prof = prof or profiler.Profiler()
+        pygame.init()
+        pygame.mixer.init(frequency=44100, size=-16, channels=2)
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Ruins of Sindh")
+        self.clock = pygame.time.Clock()
+        self.seed = seed
+        random.seed(seed)
+
+        # --- Audio ---
+        self.sfx = {k: generate_sfx(k) for k in audio.SFX_KINDS}
+        self.voices = voices.VoiceManager(self.sfx)
+        self.prof.attach(self.voices)
+        self.theme = music.ThemeScheduler()
+        self.theme.start()
+
+        # --- Leaderboard (None keeps it in memory) ---
+        self.leaderboard = Leaderboard(leaderboard_path)
+
+        # --- Fonts ---
+        self.texts = fonts.TextRenderer(resource_path("Jersey10-Regular.ttf"))
+        self.pixel_title, self.pixel_sub, self.pixel_btn, self.pixel_desc = (self.texts.font(s) for s in (120, 45, 35, 24))
+        self.score_text = fonts.DynamicText(self.pixel_sub, (255,255,255))
+
+        # --- Render scale (only the scene; simulation, HUD and touch input stay at screen size) ---
+        render_scale = render_scale or RENDER_SCALE
+        self.dynamic_scale = render_scale == "auto"
+        self.render_scale = RENDER_SCALES[0] if self.dynamic_scale else float(render_scale)
+        self.draw_ms = deque(maxlen=simulation.TICK_RATE)
+        self.scaled_assets = {}
+        self.next_scene, self._prebuild = None, None  # auto mode: the next step down, built off the main thread
+
+        self.load_assets()
+
+        # --- State ---
+        self.world = self.scene = self.hud = None  # built by finish_loading
+        self.first_frame_ms = None
+        self.stepper = simulation.FixedStep()
+        self.ticks = 0
+        self.running = True
+        self.game_state = "MENU"
+        self.paused, self.music_enabled, self.show_guide = False, True, False
+        self.player_name, self.name_taken_warning = "", False
+        self.reading_card, self.is_high_score = None, False
+        self.view_alpha = 1.0
+
+        # Touch variables
+        self.touch_moving_right = False
+        self.touch_moving_left = False
+        self.touch_jump = False
+
+        self.touch_buttons = overlays.TouchButtons([(L_HIT, "<", self.pixel_sub), (R_HIT, ">", self.pixel_sub), (J_HIT, "JUMP", self.pixel_btn)], self.texts)
+        self.touch_regions = self.touch_buttons.regions()
+        self.compositor = overlays.Compositor((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.distress = self.compositor.vignette((110, 0, 0))
+        self.prof_font = self.texts.font(18)
+
+    # --- 3. Loading Assets ---
+    def load_assets(self):
+        self.assets = assets.AssetManager((SCREEN_WIDTH, SCREEN_HEIGHT), [resource_path(p) for p in ASSET_SOURCES], ASSET_BUILDERS,
+                                          budget=ASSET_BUDGET_MB << 20, use_bundle=os.environ.get("RUINS_ASSET_BUNDLE") != "0")
+        for name in MENU_ASSETS: self.assets.get(name)
+        self.btn_on, self.btn_off, self.btn_quit_icon = (self.assets.get(n) for n in ("btn_on", "btn_off", "btn_quit"))
+        self.start_bg_img, self.game_over_img = self.assets.handle("start_bg"), self.assets.handle("game_over")
+        self.artifacts = [dict(item, card_img=self.assets.handle("card:" + item["name"]), panel=self.assets.handle("panel:" + item["name"])) for item in artifact_info]
+        # Card panels are drawn on first open and then budgeted (and evicted) like any other asset
+        for card in self.artifacts: self.assets.add("panel:" + card["name"], lambda card=card: self.card_panel(card))
+        # (scale, name) pairs; scaled layers come from their own bundle, opened (or baked) while streaming
+        scaled = self.render_scale != 1
+        self.pending = [(1, "level_width")] + [(1, n) for n in GAMEPLAY_ASSETS if not (scaled and n in LAYERS)]
+        if scaled: self.pending += [(self.render_scale, n) for n in LAYERS]
+
+    def layer_assets(self, scale):
+        # The parallax layers baked at an internal render size; the full-size ones are in self.assets
+        if scale == 1: return self.assets
+        if scale not in self.scaled_assets:
+            size = (round(SCREEN_WIDTH * scale), round(SCREEN_HEIGHT * scale))
+            self.scaled_assets[scale] = assets.AssetManager(size, [resource_path(p) for p in LAYER_SOURCES], layer_builders(size[1]),
+                                                            budget=ASSET_BUDGET_MB << 20, use_bundle=os.environ.get("RUINS_ASSET_BUNDLE") != "0")
+        return self.scaled_assets[scale]
+
+    def stream_assets(self, budget_ms=8):
+        self.prebuild_scene()
+        t = time.perf_counter()
+        while self.pending and (time.perf_counter() - t) * 1000 < budget_ms:
+            scale, name = self.pending.pop(0); self.layer_assets(scale).get(name)
+        if not self.pending: self.finish_loading()
+
+    def finish_loading(self):
+        # Everything PLAYING needs; normally streamed during NAMING, forced here if the player is quicker
+        while self.pending:
+            scale, name = self.pending.pop(0); self.layer_assets(scale).get(name)
+        if self.world is not None: return
+        get = self.assets.get
+        self.level_width = get("level_width")
+        self.set_scene(self.make_scene(self.render_scale, self.level_width))
+        self.prebuild_scene()
+        self.level = build_level(get, self.level_width)
+        self.world = simulation.World(self.level, self.seed)
+        self.hud = render.Hud(get("full_hp_seal"), get("empty_hp_seal"), simulation.MAX_HP, {it["name"]: get("icon:" + it["name"]) for it in artifact_info}, SCREEN_WIDTH)
+        self.prof.attach(self.world)
+
+    def make_scene(self, scale, level_width):
+        layers = self.layer_assets(scale)
+        backdrop, background, front = (layers.get(n) for n in LAYERS)
+        # Tiled at the simulation's loop length, not the rounded width of the scaled layers, so scenery keeps pace with pickups
+        scene = render.SceneRenderer(self.screen, backdrop, background, front, level_width * scale, scale)
+        # The scene keeps its own prepared copies of the layers
+        layers.evict(*LAYERS)
+        return scene
+
+    def set_scene(self, scene):
+        self.scene, self.render_scale = scene, scene.scale
+        self.prof.attach(scene)
+
+    def prebuild_scene(self):
+        # Auto mode: the next lower scale is decoded and prepared on a worker thread from NAMING on
+        # (and again after every step), so stepping down never loads anything on the main thread
+        lower = [s for s in RENDER_SCALES if s < self.render_scale]
+        if not (self.dynamic_scale and lower) or self.next_scene is not None or self._prebuild is not None and self._prebuild.is_alive(): return
+        scale, level_width = lower[0], self.assets.get("level_width")
+
+        def build():
+            scene = self.make_scene(scale, level_width)
+            scene.warm()
+            self.next_scene = scene
+        self._prebuild = threading.Thread(target=build, daemon=True)
+        self._prebuild.start()
+
+    def lower_render_scale(self):
+        # Dynamic mode: one step down per window of slow frames, never back up within a run;
+        # until the prebuilt scene is ready the step is simply retried after the next window
+        if self.next_scene is not None:
+            self.set_scene(self.next_scene); self.next_scene = None
+            self.prebuild_scene()
+        self.draw_ms.clear()
+
+    def draw_text_with_outline(self, surf, text, font, pos, text_col, shadow_col, thickness=4, center=False, right=False):
+        self.texts.draw_outlined(surf, text, font, pos, text_col, shadow_col, thickness, center, right)
+
+    def card_panel(self, card):
+        panel = pygame.Surface((700, 500), pygame.SRCALPHA)
+        pygame.draw.rect(panel, (40, 30, 20), panel.get_rect(), border_radius=15)
+        pygame.draw.rect(panel, (255, 220, 100), panel.get_rect(), width=3, border_radius=15)
+        panel.blit(card["card_img"].get(), (30, 40))
+        self.draw_text_with_outline(panel, card["name"], self.pixel_sub, (370, 50), (255, 220, 100), (0,0,0))
+        for i, line in enumerate(self.texts.wrap(card["info"], self.pixel_desc, 320)):
+            panel.blit(self.texts.render(line, self.pixel_desc, (255,255,255)), (370, 120 + i*30))
+        return panel
+
+    # --- 4. Global State & Reset ---
+    def update_music(self, loop):
+        self.theme.set_loop(loop, play=self.music_enabled)
+
+    def reset_game(self):
+        self.world.reset(); self.stepper.reset()
+        self.paused, self.is_high_score, self.touch_jump = False, False, False
+        self.update_music(0)
+
+    def close_assets(self, wait=False):
+        # Bundle bakes still running are finished (tools) or cancelled (quitting) before SDL goes away
+        if self._prebuild is not None: self._prebuild.join()
+        for m in (self.assets, *self.scaled_assets.values()): m.join() if wait else m.close()
+
+    def quit(self):
+        self.leaderboard.flush(); self.prof.dump(); self.close_assets(); pygame.quit(); sys.exit()
+
+    # --- 5. Events ---
+    def handle_event(self, event):
+        sfx = self.voices
+        if event.type == pygame.QUIT: self.running = False; return
 
-def update_music(loop):
-    global current_theme, music_enabled
-    current_theme.stop()
-    speed = min(1.0 + (loop * 0.08), 1.8)
-    current_theme = generate_mohenjo_theme(speed)
-    if music_enabled: current_theme.play(loops=-1)
-
-def reset_game():
-    global hp, player_x, player_y, camera_x, collected_inventory, arrows_in_flight, loop_count, total_score, paused, is_moving, anim_idx, anim_timer, invuln_timer, is_high_score
-    hp = 4; player_x, player_y = 400, 615; camera_x = 0; collected_inventory = {}
-    arrows_in_flight = []; loop_count, total_score = 0, 0; paused, is_moving = False, False
-    anim_idx, anim_timer = 0, 0; invuln_timer = 0; is_high_score = False
-    for p in pickup_objects: p["active"] = True
-    update_music(0)
-
-current_theme.play(-1)
-
-# --- 7. Main Loop ---
-while True:
-    clock.tick(60)
-    curr_ms = pygame.time.get_ticks()
-    mouse_pos = pygame.mouse.get_pos()
-    
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT: pygame.quit(); sys.exit()
-        
         # TOUCH/MOUSE COORDINATES
-        if event.type in [pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION]:
+        if event.type in [pygame.FINGERDOWN, pygame.FINGERUP]:
             tx, ty = event.x * SCREEN_WIDTH, event.y * SCREEN_HEIGHT
-        else:
-            tx, ty = mouse_pos
+        elif event.type in [pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP]:
+            tx, ty = event.pos
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3: self.prof.toggle(); return
 
         if event.type == pygame.KEYDOWN:
-            if game_state == "NAMING":
-                name_taken_warning = False
-                if event.key == pygame.K_RETURN and player_name.strip():
-                    if any(e['name'].lower() == player_name.strip().lower() for e in load_leaderboard()):
-                        name_taken_warning = True
-                    else: sfx["click"].play(); game_state = "PLAYING"; reset_game()
-                elif event.key == pygame.K_BACKSPACE: player_name = player_name[:-1]
-                elif event.key == pygame.K_ESCAPE: game_state = "MENU"
+            if self.game_state == "NAMING":
+                self.name_taken_warning = False
+                if event.key == pygame.K_RETURN and self.player_name.strip():
+                    if self.leaderboard.is_name_taken(self.player_name):
+                        self.name_taken_warning = True
+                    else: sfx.play("click"); self.finish_loading(); self.game_state = "PLAYING"; self.reset_game()
+                elif event.key == pygame.K_BACKSPACE: self.player_name = self.player_name[:-1]
+                elif event.key == pygame.K_ESCAPE: self.game_state = "MENU"
                 else:
-                    if len(player_name) < 12: player_name += event.unicode
-            elif game_state == "PLAYING":
+                    if len(self.player_name) < 12: self.player_name += event.unicode
+            elif self.game_state == "PLAYING":
                 if event.key in [pygame.K_ESCAPE, pygame.K_p]:
-                    if reading_card: reading_card = None
-                    else: paused = not paused; sfx["click"].play()
+                    if self.reading_card: self.reading_card = None
+                    else: self.paused = not self.paused; sfx.play("click")
 
         if event.type == pygame.FINGERDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-            if game_state == "MENU":
-                if show_guide: show_guide = False
-                elif pygame.Rect(SCREEN_WIDTH//2-380, 380, 280, 60).collidepoint((tx, ty)): sfx["click"].play(); game_state = "NAMING"
-                elif pygame.Rect(SCREEN_WIDTH//2-380, 460, 280, 60).collidepoint((tx, ty)): sfx["click"].play(); show_guide = True
+            if self.game_state == "MENU":
+                if self.show_guide: self.show_guide = False
+                elif pygame.Rect(SCREEN_WIDTH//2-380, 380, 280, 60).collidepoint((tx, ty)): sfx.play("click"); self.game_state = "NAMING"
+                elif pygame.Rect(SCREEN_WIDTH//2-380, 460, 280, 60).collidepoint((tx, ty)): sfx.play("click"); self.show_guide = True
                 elif pygame.Rect(30, SCREEN_HEIGHT - 110, ICON_SIZE, ICON_SIZE).collidepoint((tx, ty)):
-                    music_enabled = not music_enabled
-                    current_theme.play(-1) if music_enabled else current_theme.stop()
-                elif pygame.Rect(130, SCREEN_HEIGHT - 110, ICON_SIZE, ICON_SIZE).collidepoint((tx, ty)): pygame.quit(); sys.exit()
-            
-            elif game_state == "PLAYING":
-                if paused:
-                    if pygame.Rect(SCREEN_WIDTH//2 - 140, 450, 280, 60).collidepoint((tx, ty)): sfx["click"].play(); game_state = "MENU"; paused = False
-                elif reading_card: reading_card = None
+                    self.music_enabled = not self.music_enabled
+                    self.theme.play() if self.music_enabled else self.theme.stop()
+                elif pygame.Rect(130, SCREEN_HEIGHT - 110, ICON_SIZE, ICON_SIZE).collidepoint((tx, ty)): self.running = False
+
+            elif self.game_state == "PLAYING":
+                if self.paused:
+                    if pygame.Rect(SCREEN_WIDTH//2 - 140, 450, 280, 60).collidepoint((tx, ty)): sfx.play("click"); self.game_state = "MENU"; self.paused = False
+                elif self.reading_card: self.reading_card = None
                 else:
                     clicked_inv = False
-                    for i, (name, data) in enumerate(collected_inventory.items()):
+                    for i, (name, data) in enumerate(self.world.collected.items()):
                         if data["rect"].collidepoint((tx, ty)):
-                            reading_card = next((it for it in artifact_info if it["name"] == name), None); sfx["click"].play()
+                            self.reading_card = next((it for it in self.artifacts if it["name"] == name), None); sfx.play("click")
                             clicked_inv = True
-                    
+
                     if not clicked_inv:
                         if L_HIT.collidepoint((tx, ty)):
-                            touch_moving_left = True
-                            touch_moving_right = False
+                            self.touch_moving_left = True
+                            self.touch_moving_right = False
                         elif R_HIT.collidepoint((tx, ty)):
-                            touch_moving_right = True
-                            touch_moving_left = False
+                            self.touch_moving_right = True
+                            self.touch_moving_left = False
                         elif J_HIT.collidepoint((tx, ty)):
-                            if jumps_left > 0:
-                                vel_y = base_jump; jumps_left -= 1; sfx["jump"].play(); is_grounded = False
-            
-            elif game_state == "GAMEOVER":
-                save_to_leaderboard(player_name, total_score); reset_game(); game_state = "MENU"
+                            self.touch_jump = True
+
+            elif self.game_state == "GAMEOVER":
+                self.leaderboard.add(self.player_name, self.world.total_score); self.reset_game(); self.game_state = "MENU"
 
         if event.type == pygame.FINGERUP or event.type == pygame.MOUSEBUTTONUP:
-            touch_moving_left = False
-            touch_moving_right = False
-
-    # Logic Updates
-    if game_state == "PLAYING" and not paused and not reading_card:
-        current_speed = base_speed + (loop_count * 0.4)
-        if invuln_timer > 0: invuln_timer -= 1
-        if hp == 1 and curr_ms - heartbeat_timer > 600:
-            sfx["heartbeat"].play(); heartbeat_timer = curr_ms
-
-        is_moving = False
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d] or touch_moving_right: 
-            player_x += current_speed; player_direction = 1; is_moving = True
-        if (keys[pygame.K_LEFT] or keys[pygame.K_a] or touch_moving_left) and player_x > camera_x: 
-            player_x -= current_speed; player_direction = -1; is_moving = True
-        
-        if (keys[pygame.K_SPACE] or keys[pygame.K_w]) and not jump_pressed and jumps_left > 0:
-            vel_y = base_jump; jumps_left -= 1; jump_pressed = True; sfx["jump"].play(); is_grounded = False
-        if not (keys[pygame.K_SPACE] or keys[pygame.K_w]): jump_pressed = False
-        
-        vel_y += gravity; player_y += vel_y
-        camera_x = max(0, player_x - 400)
-
-        is_grounded = False
-        try:
-            lx, ly = int(player_x % level_width), int(player_y)
-            on_float = floating_guides.get_at((lx, ly))[3] > 0 if 0 <= ly < SCREEN_HEIGHT else False
-            if (player_y >= 615) or (vel_y > 0 and on_float):
-                player_y = 615 if player_y >= 615 else ly
-                vel_y, jumps_left, is_grounded = 0, 2, True
-        except: pass
-
-        anim_timer += 0.15
-        current_set = run_frames if is_moving else idle_frames
-        current_masks = run_masks if is_moving else idle_masks
-        if is_moving: anim_timer += 0.08
-        if anim_timer >= 1:
-            anim_idx = (anim_idx + 1) % len(current_set)
-            anim_timer = 0
-        active_sprite = current_set[anim_idx]
-        active_mask = current_masks[anim_idx]
-        p_rect = active_sprite.get_rect(midbottom=(player_x - camera_x, player_y))
-
-        spawn_delay = random.randint(max(150, 700 - (loop_count * 80)), max(350, 1100 - (loop_count * 60)))
-        if curr_ms - last_spawn_time > spawn_delay:
-            temp = random.choice(arrow_templates)
-            tx = random.randint(int(camera_x) + 50, int(camera_x) + SCREEN_WIDTH - 50)
-            arrows_in_flight.append({"img": temp["img"], "mask": temp["mask"], "pos": [tx, -100], "vel": 7 + (loop_count * 1.2) + random.uniform(-1.0, 2.5)})
-            sfx["whoosh"].play(); last_spawn_time = curr_ms
-
-        for a in arrows_in_flight[:]:
-            a["pos"][1] += a["vel"]
-            ox, oy = (a["pos"][0] - camera_x) - p_rect.x, a["pos"][1] - p_rect.y
-            if active_mask.overlap(a["mask"], (ox, oy)):
-                if invuln_timer <= 0:
-                    hp -= 1; sfx["hit"].play(); invuln_timer = 60
-                arrows_in_flight.remove(a)
-            elif a["pos"][1] > SCREEN_HEIGHT: arrows_in_flight.remove(a)
-
-        for p in pickup_objects:
-            p_world_x = p["rect"].x + (loop_count * level_width)
-            if p["active"]:
-                ox, oy = (p_world_x - camera_x) - p_rect.x, p["rect"].y - p_rect.y
-                if active_mask.overlap(p["mask"], (ox, oy)):
-                    p["active"] = False; sfx["pickup"].play()
-                    collected_inventory[p["name"]] = {"rect": pygame.Rect(0,0,0,0)}
-                    total_score += 500 * (loop_count + 1)
-
-        if player_x > (loop_count + 1) * level_width:
-            loop_count += 1; update_music(loop_count)
-            for p in pickup_objects: p["active"] = True
-
-        if hp <= 0 or player_y > SCREEN_HEIGHT + 100:
-            game_state = "GAMEOVER"; current_theme.stop()
-            if is_new_best(total_score): is_high_score = True; sfx["highscore"].play()
-            else: sfx["gameover"].play()
-            if player_y > SCREEN_HEIGHT: sfx["pitfall"].play()
-
-    # --- 8. Rendering ---
-    def get_font(size):
-        try: return pygame.font.Font(resource_path("Jersey10-Regular.ttf"), size)
-        except: return pygame.font.SysFont("monospace", size, bold=True)
-    pixel_title, pixel_sub, pixel_btn, pixel_desc = get_font(120), get_font(45), get_font(35), get_font(24)
-
-    if game_state in ["PLAYING", "GAMEOVER"]:
-        bg_off = camera_x % level_width
-        bd_off = (camera_x * 0.4) % backdrop.get_width()
-        for i in range(2):
-            bx = int(i * level_width - bg_off)
-            screen.blit(backdrop, (int(i * backdrop.get_width() - bd_off), 0))
-            screen.blit(background, (bx, 0))
-            if bx < SCREEN_WIDTH: screen.blit(background, (bx + level_width - 1, 0))
-            for p in pickup_objects:
-                if p["active"]: screen.blit(p["img"], (p["rect"].x + bx, p["rect"].y + (math.sin(curr_ms * 0.005) * 8)))
-
-        if invuln_timer % 10 < 5:
-            flipped = pygame.transform.flip(active_sprite, player_direction == -1, False)
-            screen.blit(flipped, p_rect)
-        
-        for a in arrows_in_flight: screen.blit(a["img"], (a["pos"][0] - camera_x, a["pos"][1]))
-        for i in range(2): screen.blit(front_pillars, (int(i * level_width - bg_off), 0))
-        
-        if game_state == "PLAYING" and hp == 1:
-            alpha = int(140 + math.sin(curr_ms * 0.01) * 60)
-            vignette_surf.set_alpha(alpha); screen.blit(vignette_surf, (0,0))
-
-        for i in range(MAX_HP): screen.blit(full_hp_seal if i < hp else empty_hp_seal, (30 + i*70, 30))
-        for i, (name, data) in enumerate(collected_inventory.items()):
-            item = next(it for it in artifact_info if it["name"] == name)
-            data["rect"] = pygame.Rect(SCREEN_WIDTH - 80 - (i * 90), 20, 60, 80)
-            screen.blit(item["icon_img"], data["rect"])
-        
-        score_surf = pixel_sub.render(f"SCORE: {total_score}", True, (255,255,255))
-        screen.blit(score_surf, (SCREEN_WIDTH - score_surf.get_width() - 20, 110))
-
-        if paused:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA); overlay.fill((0, 0, 0, 150)); screen.blit(overlay, (0, 0))
-            draw_text_with_outline(screen, "GAME PAUSED", pixel_title, (SCREEN_WIDTH//2, 250), (255, 255, 255), (0,0,0), center=True)
-            r = pygame.Rect(SCREEN_WIDTH//2 - 140, 450, 280, 60); pygame.draw.rect(screen, (180, 140, 40), r, border_radius=5)
-            lbl = pixel_btn.render("MAIN MENU", True, (0,0,0)); screen.blit(lbl, (r.centerx - lbl.get_width()//2, r.centery - lbl.get_height()//2))
-
-        if reading_card:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA); overlay.fill((0, 0, 0, 200)); screen.blit(overlay, (0, 0))
-            pygame.draw.rect(screen, (40, 30, 20), (SCREEN_WIDTH//2 - 350, 100, 700, 500), border_radius=15)
-            pygame.draw.rect(screen, (255, 220, 100), (SCREEN_WIDTH//2 - 350, 100, 700, 500), width=3, border_radius=15)
-            screen.blit(reading_card["card_img"], (SCREEN_WIDTH//2 - 320, 140))
-            draw_text_with_outline(screen, reading_card["name"], pixel_sub, (SCREEN_WIDTH//2 + 20, 150), (255, 220, 100), (0,0,0))
-            words = reading_card["info"].split(' '); line, y_off = "", 220
-            for word in words:
-                if pixel_desc.size(line + word)[0] < 320: line += word + " "
-                else:
-                    screen.blit(pixel_desc.render(line, True, (255,255,255)), (SCREEN_WIDTH//2 + 20, y_off)); line = word + " "; y_off += 30
-            screen.blit(pixel_desc.render(line, True, (255,255,255)), (SCREEN_WIDTH//2 + 20, y_off))
-
-        if game_state == "GAMEOVER":
-            screen.blit(game_over_img, (SCREEN_WIDTH//2-400, 150))
-            if is_high_score: draw_text_with_outline(screen, "NEW BEST SCORE!", pixel_sub, (SCREEN_WIDTH//2, 580), (255, 215, 0), (0,0,0), center=True)
-
-        # --- PROFESSIONAL TOUCH OVERLAY ---
-        if game_state == "PLAYING" and not paused and not reading_card:
-            overlay_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            btns = [(L_HIT, "<", touch_moving_left), (R_HIT, ">", touch_moving_right), (J_HIT, "JUMP", not is_grounded)]
-            for rect, label, is_active in btns:
-                color = (255, 220, 100, 180) if is_active else (255, 255, 255, 70)
-                draw_rect = rect.inflate(10, 10) if is_active else rect
-                pygame.draw.ellipse(overlay_surf, color, draw_rect, width=3)
-                pygame.draw.ellipse(overlay_surf, (color[0], color[1], color[2], 40), draw_rect)
-                f = pixel_btn if label == "JUMP" else pixel_sub
-                lbl = f.render(label, True, color)
-                overlay_surf.blit(lbl, (draw_rect.centerx - lbl.get_width()//2, draw_rect.centery - lbl.get_height()//2))
-            screen.blit(overlay_surf, (0, 0))
-
-    elif game_state in ["MENU", "NAMING"]:
-        screen.blit(start_bg_img, (0, 0))
-        draw_text_with_outline(screen, "RUINS OF SINDH", pixel_title, (SCREEN_WIDTH//2, 100), (255, 220, 100), (0,0,0), thickness=6, center=True)
-        if game_state == "MENU":
-            for i, text in enumerate(["PLAY", "HOW TO PLAY"]):
-                r = pygame.Rect(SCREEN_WIDTH//2-380, 380 + i*80, 280, 60); pygame.draw.rect(screen, (180, 140, 40), r, border_radius=5)
-                lbl = pixel_btn.render(text, True, (0,0,0)); screen.blit(lbl, (r.centerx - lbl.get_width()//2, r.centery - lbl.get_height()//2))
-            lb_card = pygame.Rect(SCREEN_WIDTH//2 + 80, 320, 400, 260)
-            pygame.draw.rect(screen, (40, 30, 20, 180), lb_card, border_radius=10)
-            pygame.draw.rect(screen, (255, 220, 100), lb_card, width=3, border_radius=10)
-            draw_text_with_outline(screen, "HALL OF FAME", pixel_sub, (lb_card.centerx, lb_card.y + 30), (255, 220, 100), (0,0,0), center=True)
-            for i, entry in enumerate(load_leaderboard()):
-                color = (255, 255, 255) if i > 0 else (255, 215, 0)
-                screen.blit(pixel_desc.render(f"{i+1}. {entry['name']}: {entry['score']}", True, color), (lb_card.x + 40, lb_card.y + 80 + i*30))
-            screen.blit(btn_on if music_enabled else btn_off, (30, SCREEN_HEIGHT - 110))
-            screen.blit(btn_quit_icon, (130, SCREEN_HEIGHT - 110))
-            if show_guide:
-                overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA); overlay.fill((0,0,0,220)); screen.blit(overlay, (0,0))
-                pygame.draw.rect(screen, (40, 30, 20), (290, 120, 700, 480), border_radius=10)
-                lines = ["- JOURNEY THROUGH ANCIENT SINDH -", "LEFT/RIGHT: Move | JUMP: Action Button", "Click anywhere to close this guide."]
-                for i, l in enumerate(lines): screen.blit(pixel_desc.render(l, True, (255, 220, 100) if i==0 else (255,255,255)), (330, 160 + i*32))
-        elif game_state == "NAMING":
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA); overlay.fill((0,0,0,200)); screen.blit(overlay, (0,0))
-            ns = pixel_sub.render(f"NAME: {player_name}|", True, (255,255,255))
-            screen.blit(ns, (SCREEN_WIDTH//2 - ns.get_width()//2, SCREEN_HEIGHT//2 - 20))
-            if name_taken_warning: screen.blit(pixel_desc.render("NAME TAKEN!", True, (255, 80, 80)), (SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 + 40))
-
-    pygame.display.flip()
\ No newline at end of file
+            self.touch_moving_left = False
+            self.touch_moving_right = False
+
+    # --- 6. Logic Updates (fixed timestep; draw() interpolates between ticks) ---
+    def update(self, frame_ms, keys):
+        world, sfx = self.world, self.voices
+        # A tempo tier still rendering at the loop boundary is swapped in once it's ready
+        self.theme.update()
+        if self.game_state == "NAMING": self.stream_assets()
+        if not (self.game_state == "PLAYING" and not self.paused and not self.reading_card):
+            self.stepper.reset(); self.view_alpha = 1.0
+            sfx.flush(); return
+        inp = simulation.Input(keys[0] or self.touch_moving_right, keys[1] or self.touch_moving_left, keys[2], self.touch_jump)
+        for _ in range(self.stepper.advance(frame_ms)):
+            self.ticks += 1
+            for e in world.step(inp):
+                if e == "loop": self.update_music(world.loop_count)
+                elif e != "gameover": sfx.play(e)
+            inp = inp._replace(jump_tap=False); self.touch_jump = False
+            if world.over:
+                self.game_state = "GAMEOVER"; self.theme.stop()
+                if self.leaderboard.is_new_best(world.total_score): self.is_high_score = True; sfx.play("highscore")
+                else: sfx.play("gameover")
+                if world.fell: sfx.play("pitfall")
+                break
+        self.view_alpha = self.stepper.alpha if self.game_state == "PLAYING" else 1.0
+        sfx.flush()
+
+    # --- 7. Rendering ---
+    def draw(self, curr_ms):
+        t0 = time.perf_counter()
+        screen, world, texts, scene, lap = self.screen, self.world, self.texts, self.scene, self.prof.lap
+        game_state = self.game_state
+        if scene is not None:
+            scene.watch("profiler", self.prof.visible, [self.prof.rect])
+            if self.prof.visible: scene.mark(self.prof.rect)
+        if game_state in ["PLAYING", "GAMEOVER"]:
+            view_x, view_y, camera_x = world.view(self.view_alpha)
+            active_sprite, _, p_rect = world.anim.pose(world.anim_idx, world.player_direction, view_x - camera_x, view_y)
+            bob = math.sin(curr_ms * 0.005) * 8
+            sprites = []
+            for i in range(2):
+                bx = int(i * self.level_width - camera_x % self.level_width)
+                for p in world.pickups:
+                    if p["active"] and -p["rect"].w < p["rect"].x + bx < SCREEN_WIDTH:
+                        sprites.append((p["img"], pygame.Rect(p["rect"].x + bx, p["rect"].y + bob, p["rect"].w, p["rect"].h)))
+            sprites.append((active_sprite if world.invuln_timer % 10 < 5 else None, p_rect))
+            for img, ax, ay in world.arrows.sprites(camera_x, self.view_alpha): sprites.append((img, img.get_rect(topleft=(ax, ay))))
+
+            # HUD and touch buttons are translucent, so their rects are restored every frame, not only on change
+            scene.mark(*self.hud.update(world.hp, world.collected, self.score_text.get(f"SCORE: {world.total_score}")), *self.hud.rects, *self.touch_regions)
+            lap("render.prep")
+            scene.draw_scene(camera_x, sprites, allow_partial=game_state == "PLAYING" and not self.paused and not self.reading_card and world.hp != 1)
+
+            if game_state == "PLAYING" and world.hp == 1:
+                self.distress.draw(screen, (140 + math.sin(curr_ms * 0.01) * 60) / 255)
+
+            self.hud.draw(screen)
+            lap("render.hud")
+
+            if self.paused:
+                self.compositor.dim(screen, 150)
+                self.draw_text_with_outline(screen, "GAME PAUSED", self.pixel_title, (SCREEN_WIDTH//2, 250), (255, 255, 255), (0,0,0), center=True)
+                r = pygame.Rect(SCREEN_WIDTH//2 - 140, 450, 280, 60); pygame.draw.rect(screen, (180, 140, 40), r, border_radius=5)
+                lbl = texts.render("MAIN MENU", self.pixel_btn, (0,0,0)); screen.blit(lbl, (r.centerx - lbl.get_width()//2, r.centery - lbl.get_height()//2))
+
+            if self.reading_card:
+                card = self.reading_card
+                self.compositor.dim(screen, 200)
+                screen.blit(card["panel"].get(), (SCREEN_WIDTH//2 - 350, 100))
+
+            if game_state == "GAMEOVER":
+                screen.blit(self.game_over_img.get(), (SCREEN_WIDTH//2-400, 150))
+                if self.is_high_score: self.draw_text_with_outline(screen, "NEW BEST SCORE!", self.pixel_sub, (SCREEN_WIDTH//2, 580), (255, 215, 0), (0,0,0), center=True)
+            lap("render.overlays")
+
+            # --- PROFESSIONAL TOUCH OVERLAY ---
+            if game_state == "PLAYING" and not self.paused and not self.reading_card:
+                self.touch_buttons.draw(screen, (self.touch_moving_left, self.touch_moving_right, not world.is_grounded))
+            lap("render.touch")
+
+        elif game_state in ["MENU", "NAMING"]:
+            screen.blit(self.start_bg_img.get(), (0, 0))
+            self.draw_text_with_outline(screen, "RUINS OF SINDH", self.pixel_title, (SCREEN_WIDTH//2, 100), (255, 220, 100), (0,0,0), thickness=6, center=True)
+            if game_state == "MENU":
+                for i, text in enumerate(["PLAY", "HOW TO PLAY"]):
+                    r = pygame.Rect(SCREEN_WIDTH//2-380, 380 + i*80, 280, 60); pygame.draw.rect(screen, (180, 140, 40), r, border_radius=5)
+                    lbl = texts.render(text, self.pixel_btn, (0,0,0)); screen.blit(lbl, (r.centerx - lbl.get_width()//2, r.centery - lbl.get_height()//2))
+                lb_card = pygame.Rect(SCREEN_WIDTH//2 + 80, 320, 400, 260)
+                pygame.draw.rect(screen, (40, 30, 20, 180), lb_card, border_radius=10)
+                pygame.draw.rect(screen, (255, 220, 100), lb_card, width=3, border_radius=10)
+                self.draw_text_with_outline(screen, "HALL OF FAME", self.pixel_sub, (lb_card.centerx, lb_card.y + 30), (255, 220, 100), (0,0,0), center=True)
+                for i, entry in enumerate(self.leaderboard.page(0)):
+                    color = (255, 255, 255) if i > 0 else (255, 215, 0)
+                    screen.blit(texts.render(f"{i+1}. {entry['name']}: {entry['score']}", self.pixel_desc, color), (lb_card.x + 40, lb_card.y + 80 + i*30))
+                screen.blit(self.btn_on if self.music_enabled else self.btn_off, (30, SCREEN_HEIGHT - 110))
+                screen.blit(self.btn_quit_icon, (130, SCREEN_HEIGHT - 110))
+                if self.show_guide:
+                    self.compositor.dim(screen, 220)
+                    pygame.draw.rect(screen, (40, 30, 20), (290, 120, 700, 480), border_radius=10)
+                    lines = ["- JOURNEY THROUGH ANCIENT SINDH -", "LEFT/RIGHT: Move | JUMP: Action Button", "Click anywhere to close this guide."]
+                    for i, l in enumerate(lines): screen.blit(texts.render(l, self.pixel_desc, (255, 220, 100) if i==0 else (255,255,255)), (330, 160 + i*32))
+            elif game_state == "NAMING":
+                self.compositor.dim(screen, 200)
+                ns = texts.render(f"NAME: {self.player_name}|", self.pixel_sub, (255,255,255))
+                screen.blit(ns, (SCREEN_WIDTH//2 - ns.get_width()//2, SCREEN_HEIGHT//2 - 20))
+                if self.name_taken_warning: screen.blit(texts.render("NAME TAKEN!", self.pixel_desc, (255, 80, 80)), (SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 + 40))
+            lap("render.menu")
+
+        self.prof.draw(screen, self.prof_font)
+        lap("profiler")
+        if scene is not None: scene.present()
+        else: pygame.display.flip()
+        lap("flip")
+        if self.first_frame_ms is None: self.first_frame_ms = (time.perf_counter() - START_TIME) * 1000
+        if self.dynamic_scale and game_state == "PLAYING" and not self.paused:
+            self.draw_ms.append((time.perf_counter() - t0) * 1000)
+            if len(self.draw_ms) == self.draw_ms.maxlen and sorted(self.draw_ms)[len(self.draw_ms) // 2] > RENDER_BUDGET_MS: self.lower_render_scale()
+
+    # --- 8. Main Loop ---
+    def run(self, record_path=None):
+        # Recording captures every frame's inputs so headless.py can replay the session exactly
+        log = inputlog.InputLog(self.seed) if record_path else None
+        state = inputlog.StateHash() if log is not None else None
+        self.theme.play()
+        while self.running:
+            frame_ms = self.clock.tick(RENDER_FPS)
+            self.prof.begin_frame()
+            events, keys = pygame.event.get(), read_keys()
+            if log is not None: frame_ms, keys, events = log.add(frame_ms, keys, events)
+            for event in events: self.handle_event(event)
+            self.prof.lap("events")
+            self.update(frame_ms, keys)
+            self.prof.lap("logic")
+            if state is not None: state.update(self)
+            self.draw(pygame.time.get_ticks())
+            self.prof.end_frame(len(self.world.arrows) if self.world else 0)
+        if log is not None:
+            log.finish(self, state); log.save(record_path)
+        self.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ruins of Sindh")
+    parser.add_argument("--record", metavar="PATH", help="record this session's inputs for headless.py --replay")
+    parser.add_argument("--seed", type=int, help="seed the game (recordings pick one if omitted)")
+    parser.add_argument("--profile", action="store_true", help="time frame phases; F3 toggles the graph")
+    parser.add_argument("--profile-out", metavar="PATH", help="write profiler stats on exit (.json summary or .csv per frame)")
+    parser.add_argument("--render-scale", metavar="SCALE", help='scene resolution, e.g. 0.5 or 0.75, or "auto" (default: $RUINS_RENDER_SCALE or 1)')
+    args, _ = parser.parse_known_args(argv)
+    seed = args.seed
+    if args.record and seed is None: seed = random.randrange(1 << 31)
+    # Devices can't pass flags, so RUINS_PROFILE=1 turns the profiler and its graph on too
+    on_device = os.environ.get("RUINS_PROFILE") == "1"
+    prof = profiler.Profiler(args.profile or bool(args.profile_out) or on_device, args.profile_out)
+    prof.visible = args.profile or on_device
+    # A recording starts from an empty in-memory leaderboard so replays see the same name checks
+    Game(seed, None if args.record else LEADERBOARD_FILE, prof, args.render_scale).run(args.record)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import pygame
+
+# --- Player Animation Atlas ---
+# Every frame is stored for both facings together with its collision mask,
+# so drawing is a plain blit and hit tests match what is on screen.
+
+RIGHT, LEFT = 1, -1
+
+
+class AnimationAtlas:
+    def __init__(self, frames):
+        self.images = {RIGHT: list(frames), LEFT: [pygame.transform.flip(f, True, False) for f in frames]}
+        self.masks = {d: [pygame.mask.from_surface(f) for f in imgs] for d, imgs in self.images.items()}
+        # Frames are trimmed to their bounding rect and stand on their bottom-centre
+        self.anchors = [(f.get_width() // 2, f.get_height()) for f in frames]
+
+    def __len__(self):
+        return len(self.anchors)
+
+    def pose(self, idx, direction, x, y):
+        # Image, mask and screen rect for frame idx anchored at (x, y)
+        img = self.images[direction][idx]
+        ax, ay = self.anchors[idx]
+        rect = img.get_rect()
+        rect.topleft = (x - ax, y - ay)
+        return img, self.masks[direction][idx], rect
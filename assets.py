@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import shutil
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import pygame
+
+import terrain
+
+# --- Baked Asset Bundle ---
+# The result of the slow loading path (decoded, scaled and sliced images,
+# entity lists, the platform heightmap) is written once to a single file per
+# screen size. Surfaces are stored as raw
+# pixels (RGB when fully opaque, RGBA otherwise; sparse layers only as their
+# non-empty tiles, so fully transparent pixels come back as (0, 0, 0, 0));
+# everything else is JSON. The file name carries a hash of
+# every source file, so editing an image simply misses and rebuilds.
+# AssetManager keeps the bundle open and decodes each entry only when first
+# asked for, keeping decoded entries in an LRU bounded by a byte budget.
+# On a miss it bakes on a background thread, one entry at a time, and builds
+# whatever is asked for meanwhile the slow way; the bundle takes over once
+# it is written.
+# Collision masks are not stored: pygame cannot load a Mask from bytes, and
+# rebuilding them from the baked entity pixels is cheap once the full-layer
+# scans are gone.
+
+CACHE_DIR = os.path.join("cache", "assets")
+BUNDLE_VERSION = 3
+MAGIC = b"RSAB1"
+SPARSE = 0.5  # store a surface as tiles when its content covers less than this
+
+
+def source_key(paths, size):
+    h = hashlib.sha1(f"{BUNDLE_VERSION}:{size[0]}x{size[1]}:{pygame.version.ver}".encode())
+    for p in paths:
+        with open(p, "rb") as f: h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+class _Writer:
+    def __init__(self, f):
+        self.f, self.size = f, 0  # pixels go straight to f
+
+    def blob(self, data):
+        offset = self.size
+        self.f.write(data); self.size += len(data)
+        return [offset, len(data)]
+
+    def surface(self, surf):
+        w, h = surf.get_size()
+        if w and h:
+            mask = pygame.mask.from_surface(surf, 0)
+            tiles = mask.get_bounding_rects()
+            if sum(r.w * r.h for r in tiles) < SPARSE * w * h:
+                return {"$tiles": [w, h, [[r.x, r.y, r.w, r.h] + self.blob(pygame.image.tobytes(surf.subsurface(r), "RGBA")) for r in tiles]]}
+        data = pygame.image.tobytes(surf, "RGBA")
+        if data[3::4].count(255) == w * h: return {"$surf": [w, h, "RGB"] + self.blob(pygame.image.tobytes(surf, "RGB"))}
+        return {"$surf": [w, h, "RGBA"] + self.blob(data)}
+
+    def encode(self, value):
+        if isinstance(value, pygame.Surface): return self.surface(value)
+        if isinstance(value, pygame.Rect): return {"$rect": list(value)}
+        if isinstance(value, terrain.Heightmap):
+            return {"$heightmap": [value.width, value.height] + self.blob(value.offsets.tobytes()) + self.blob(value.tops.tobytes()) + self.blob(value.bottoms.tobytes())}
+        if isinstance(value, dict): return {k: self.encode(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)): return [self.encode(v) for v in value]
+        return value
+
+
+class _Reader:
+    def __init__(self, read):
+        self.blob = read  # (offset, length) -> bytes
+
+    def decode(self, value):
+        if isinstance(value, list): return [self.decode(v) for v in value]
+        if not isinstance(value, dict): return value
+        if "$surf" in value:
+            w, h, fmt, offset, length = value["$surf"]
+            return pygame.image.frombuffer(self.blob(offset, length), (w, h), fmt).convert_alpha()
+        if "$tiles" in value:
+            w, h, tiles = value["$tiles"]
+            surf = pygame.Surface((w, h), pygame.SRCALPHA).convert_alpha()
+            surf.fill((0, 0, 0, 0))
+            # Tiles may overlap, but overlapping pixels are identical copies, so MAX over a clear surface is exact
+            for x, y, tw, th, offset, length in tiles:
+                surf.blit(pygame.image.frombuffer(self.blob(offset, length), (tw, th), "RGBA"), (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            return surf
+        if "$rect" in value: return pygame.Rect(value["$rect"])
+        if "$heightmap" in value:
+            w, h, *blobs = value["$heightmap"]
+            offsets, tops, bottoms = array('i'), array('h'), array('h')
+            offsets.frombytes(self.blob(*blobs[0:2])); tops.frombytes(self.blob(*blobs[2:4])); bottoms.frombytes(self.blob(*blobs[4:6]))
+            return terrain.Heightmap(w, h, offsets, tops, bottoms)
+        return {k: self.decode(v) for k, v in value.items()}
+
+
+def save(path, builders):
+    # Builds and writes one entry at a time, so baking never holds the whole set in memory
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp + ".blobs", "w+b") as blobs:
+            w = _Writer(blobs)
+            meta = json.dumps({name: w.encode(build()) for name, build in builders.items()}).encode()
+            blobs.seek(0)
+            with open(tmp, "wb") as f:
+                f.write(MAGIC + struct.pack("<I", len(meta)) + meta)
+                shutil.copyfileobj(blobs, f)
+        os.replace(tmp, path)
+    finally:
+        for name in (tmp, tmp + ".blobs"):
+            if os.path.exists(name): os.remove(name)
+
+
+class Bundle:
+    # An open bundle file; each entry is decoded on request from one bulk read of its
+    # pixel range, so nothing stays resident beyond the decoded surfaces themselves
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            head = self._file.read(len(MAGIC) + 4)
+            if len(head) < len(MAGIC) + 4 or not head.startswith(MAGIC): raise ValueError(f"{path}: not an asset bundle")
+            n, = struct.unpack_from("<I", head, len(MAGIC))
+            self.meta = json.loads(self._file.read(n))
+        except Exception:
+            self._file.close(); raise
+        self._base = len(MAGIC) + 4 + n
+        self._reader = _Reader(self._read)
+
+    def _read(self, offset, length):
+        self._file.seek(self._base + offset)
+        data = self._file.read(length)
+        if len(data) != length: raise ValueError("truncated asset bundle")
+        return data
+
+    def __contains__(self, name):
+        return name in self.meta
+
+    def get(self, name):
+        return self._reader.decode(self.meta[name])
+
+    def close(self):
+        self._file.close()
+
+
+def nbytes(value):
+    if isinstance(value, pygame.Surface): return value.get_width() * value.get_height() * value.get_bytesize()
+    if isinstance(value, terrain.Heightmap): return sum(a.itemsize * len(a) for a in (value.offsets, value.tops, value.bottoms))
+    if isinstance(value, dict): return sum(nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)): return sum(nbytes(v) for v in value)
+    return 0
+
+
+def peak_rss():
+    # Peak resident set size in bytes, or None where the platform can't tell
+    if resource is None: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Handle:
+    # A named asset that is loaded (or reloaded after eviction) when get() is called
+    def __init__(self, manager, name):
+        self.manager, self.name = manager, name
+
+    def get(self):
+        return self.manager.get(self.name)
+
+    @property
+    def loaded(self):
+        return self.name in self.manager
+
+
+class AssetManager:
+    def __init__(self, size, sources, builders, budget=None, use_bundle=True):
+        # builders: name -> zero-argument function producing the asset the slow way
+        self.builders = builders
+        self.budget = budget
+        self._cache = OrderedDict()  # name -> (value, bytes), least recently used first
+        self.resident = self.peak = 0
+        self.loads = self.evictions = 0
+        self.bundle = self._baker = None
+        self._closing = threading.Event()
+        self.runtime = {}  # name -> builder for entries made at runtime (never baked), e.g. text panels
+        if use_bundle: self._open_bundle(size, sources)
+
+    def _open_bundle(self, size, sources):
+        try: key = source_key(sources, size)
+        except OSError: return  # a missing source is reported by the normal path and never baked
+        path = os.path.join(CACHE_DIR, f"bundle_{size[0]}x{size[1]}_{key}.bin")
+        try:
+            self.bundle = Bundle(path); return
+        except (OSError, ValueError, KeyError, struct.error):
+            pass
+        self._baker = threading.Thread(target=self._bake, args=(path, f"bundle_{size[0]}x{size[1]}_"), daemon=True)
+        self._baker.start()
+
+    def _bake(self, path, prefix):
+        def build(make):
+            if self._closing.is_set(): raise InterruptedError("bake cancelled")
+            return make()
+        try:
+            save(path, {name: lambda make=make: build(make) for name, make in self.builders.items()})
+            # Bundles are large; drop the ones left behind by older sources and by bakes cut off at exit
+            for name in os.listdir(CACHE_DIR):
+                if name.startswith(prefix) and os.path.join(CACHE_DIR, name) != path:
+                    os.remove(os.path.join(CACHE_DIR, name))
+            self.bundle = Bundle(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            pass  # keep building the slow way; the next start tries again
+
+    def join(self):
+        # Waits for a bake in progress, for tools that exit (or fork workers) right after loading
+        if self._baker is not None: self._baker.join()
+
+    def close(self):
+        # Stops a bake in progress after its current entry; the next start bakes again
+        self._closing.set(); self.join()
+
+    def add(self, name, build):
+        self.runtime[name] = build
+
+    def __contains__(self, name):
+        return name in self._cache
+
+    def handle(self, name):
+        return Handle(self, name)
+
+    def get(self, name):
+        entry = self._cache.get(name)
+        if entry is not None:
+            self._cache.move_to_end(name)
+            return entry[0]
+        bundle = self.bundle
+        if bundle is not None and name in bundle: value = bundle.get(name)
+        else: value = (self.runtime.get(name) or self.builders[name])()
+        self.loads += 1
+        self._store(name, value)
+        return value
+
+    def _store(self, name, value):
+        size = nbytes(value)
+        self._cache[name] = (value, size)
+        self.resident += size
+        self.peak = max(self.peak, self.resident)
+        # Oldest first, never the entry just stored
+        while self.budget is not None and self.resident > self.budget and len(self._cache) > 1:
+            self.evict(next(iter(self._cache)))
+
+    def evict(self, *names):
+        for name in names:
+            entry = self._cache.pop(name, None)
+            if entry is not None: self.resident -= entry[1]; self.evictions += 1
@@ -0,0 +1,143 @@
+import array
+import math
+import os
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# --- Procedural Audio Synthesis ---
+# Waveforms are rendered as raw signed 16-bit PCM (native byte order) so the
+# results can be cached on disk and handed straight to pygame.mixer.Sound.
+# Rendering is batched with NumPy, which the APK ships (buildozer.spec); the
+# per-sample pure-Python path only serves desktop installs without it.
+
+SAMPLE_RATE = 44100
+CACHE_DIR = os.path.join("cache", "audio")
+SYNTH_VERSION = 1
+
+SFX_KINDS = ["whoosh", "hit", "pitfall", "pickup", "jump", "click", "gameover", "highscore", "heartbeat"]
+SFX_PARAMS = {
+    "whoosh": (0.2, 0.05), "hit": (0.2, 0.4), "pitfall": (0.4, 0.6),
+    "pickup": (0.1, 0.2), "jump": (0.08, 0.15), "click": (0.05, 0.15),
+    "gameover": (1.5, 0.4), "highscore": (1.0, 0.5), "heartbeat": (0.3, 0.3),
+}
+DEFAULT_SFX_PARAMS = (0.1, 0.2)
+
+THEME_BPM, THEME_BEATS = 105, 8
+THEME_MELODY = [196, 0, 233, 261, 196, 0, 311, 293]
+
+
+def _noise_seed(kind):
+    # Stable per-kind seed so a cached buffer and a fresh render sound alike
+    return sum(ord(c) * 31 ** i for i, c in enumerate(kind)) & 0xFFFFFFFF
+
+
+def _sfx_numpy(kind, sample_rate):
+    duration, vol = SFX_PARAMS.get(kind, DEFAULT_SFX_PARAMS)
+    n_samples = int(sample_rate * duration)
+    t = np.arange(n_samples) / sample_rate
+    rng = np.random.default_rng(_noise_seed(kind))
+    if kind == "gameover":
+        val = np.sin(2 * np.pi * 100 * t) * (1 - t / duration) + rng.uniform(-0.1, 0.1, n_samples)
+    elif kind == "highscore":
+        val = np.sin(2 * np.pi * 880 * t) * np.sin(2 * np.pi * 5 * t)
+    elif kind == "heartbeat":
+        val = np.sin(2 * np.pi * 60 * t) * np.exp(-20 * (t % 0.15))
+    else:
+        env = np.sin(np.pi * (t / duration))
+        val = (np.sin(2 * np.pi * 440 * t) + rng.uniform(-0.3, 0.3, n_samples)) * env
+    return (np.clip(val * vol, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+
+def _sfx_python(kind, sample_rate):
+    duration, vol = SFX_PARAMS.get(kind, DEFAULT_SFX_PARAMS)
+    n_samples = int(sample_rate * duration)
+    sin, exp, tau, pi = math.sin, math.exp, 2 * math.pi, math.pi
+    ts = [i / sample_rate for i in range(n_samples)]
+    uniform = random.Random(_noise_seed(kind)).uniform
+    if kind == "gameover":
+        vals = [sin(tau * 100 * t) * (1 - t / duration) + uniform(-0.1, 0.1) for t in ts]
+    elif kind == "highscore":
+        vals = [sin(tau * 880 * t) * sin(tau * 5 * t) for t in ts]
+    elif kind == "heartbeat":
+        vals = [sin(tau * 60 * t) * exp(-20 * (t % 0.15)) for t in ts]
+    else:
+        vals = [(sin(tau * 440 * t) + uniform(-0.3, 0.3)) * sin(pi * (t / duration)) for t in ts]
+    return array.array('h', [int(max(-1.0, min(1.0, v * vol)) * 32767) for v in vals]).tobytes()
+
+
+def _theme_numpy(sample_rate):
+    beat_len = 60 / THEME_BPM
+    total_samples = int(sample_rate * beat_len * THEME_BEATS)
+    t = np.arange(total_samples) / sample_rate
+    beat_idx = (t // beat_len).astype(np.int64) % THEME_BEATS
+    t_in_beat = t % beat_len
+    drum = np.sin(2 * np.pi * 60 * t) * np.exp(-12 * t_in_beat) * np.where(beat_idx % 4 == 0, 0.5, 0.2)
+    freq = np.asarray(THEME_MELODY, dtype=np.float64)[beat_idx]
+    flute = np.where(freq > 0, np.sin(2 * np.pi * freq * t) * np.sin(np.pi * (t_in_beat / beat_len)) * 0.25, 0.0)
+    return (np.clip((drum + flute) * 0.6, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+
+def _theme_python(sample_rate):
+    beat_len = 60 / THEME_BPM
+    total_samples = int(sample_rate * beat_len * THEME_BEATS)
+    sin, exp, tau, pi = math.sin, math.exp, 2 * math.pi, math.pi
+    buf = array.array('h', bytes(2 * total_samples))
+    # Render one beat at a time so the per-beat constants are hoisted out of the inner loop
+    for beat in range(int(math.ceil(total_samples / (sample_rate * beat_len)))):
+        start = int(math.ceil(beat * beat_len * sample_rate))
+        end = min(total_samples, int(math.ceil((beat + 1) * beat_len * sample_rate)))
+        beat_idx = beat % THEME_BEATS
+        drum_amp = 0.5 if beat_idx % 4 == 0 else 0.2
+        freq = THEME_MELODY[beat_idx]
+        for i in range(start, end):
+            t = i / sample_rate
+            t_in_beat = t % beat_len
+            val = sin(tau * 60 * t) * exp(-12 * t_in_beat) * drum_amp
+            if freq > 0: val += sin(tau * freq * t) * sin(pi * (t_in_beat / beat_len)) * 0.25
+            buf[i] = int(max(-1.0, min(1.0, val * 0.6)) * 32767)
+    return buf.tobytes()
+
+
+def render_sfx(kind, sample_rate=SAMPLE_RATE, use_numpy=None):
+    if use_numpy is None: use_numpy = np is not None
+    return _sfx_numpy(kind, sample_rate) if use_numpy else _sfx_python(kind, sample_rate)
+
+
+def render_theme(speed=1.0, use_numpy=None):
+    if use_numpy is None: use_numpy = np is not None
+    sample_rate = int(SAMPLE_RATE * speed)
+    return _theme_numpy(sample_rate) if use_numpy else _theme_python(sample_rate)
+
+
+# --- PCM Cache ---
+def _cache_path(kind, speed, sample_rate):
+    return os.path.join(CACHE_DIR, f"v{SYNTH_VERSION}_{kind}_{speed:.2f}_{sample_rate}.pcm")
+
+
+def _cached(kind, speed, sample_rate, render):
+    path = _cache_path(kind, speed, sample_rate)
+    try:
+        with open(path, "rb") as f: return f.read()
+    except OSError:
+        pass
+    pcm = render()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f: f.write(pcm)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return pcm
+
+
+def sfx_pcm(kind, sample_rate=SAMPLE_RATE):
+    return _cached(kind, 1.0, sample_rate, lambda: render_sfx(kind, sample_rate))
+
+
+def theme_pcm(speed=1.0):
+    return _cached("theme", speed, int(SAMPLE_RATE * speed), lambda: render_theme(speed))
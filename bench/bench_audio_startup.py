@@ -0,0 +1,90 @@
+import array
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import audio
+
+# Startup audio cost: the original per-sample loops vs the batched engine, cold and warm.
+
+THEME_SPEEDS = [1.0]
+
+
+def legacy_sfx(kind):
+    sample_rate = 44100
+    duration, vol = audio.SFX_PARAMS.get(kind, audio.DEFAULT_SFX_PARAMS)
+    n_samples = int(sample_rate * duration)
+    buf = array.array('h', [0] * n_samples)
+    for i in range(n_samples):
+        t = i / sample_rate
+        env = math.sin(math.pi * (t / duration))
+        if kind == "gameover":
+            val = (math.sin(2 * math.pi * 100 * t) * (1-t/duration)) + random.uniform(-0.1, 0.1)
+        elif kind == "highscore":
+            val = math.sin(2 * math.pi * 880 * t) * math.sin(2 * math.pi * 5 * t)
+        elif kind == "heartbeat":
+            val = math.sin(2 * math.pi * 60 * t) * math.exp(-20 * (t % 0.15))
+        else:
+            val = (math.sin(2 * math.pi * 440 * t) + random.uniform(-0.3, 0.3)) * env
+        buf[i] = int(max(-1.0, min(1.0, val * vol)) * 32767)
+    return buf.tobytes()
+
+
+def legacy_theme(speed=1.0):
+    sample_rate = int(44100 * speed)
+    bpm, total_beats = 105, 8
+    beat_len = 60 / bpm
+    total_samples = int(sample_rate * beat_len * total_beats)
+    buf = array.array('h', [0] * total_samples)
+    melody = [196, 0, 233, 261, 196, 0, 311, 293]
+    for i in range(total_samples):
+        t = i / sample_rate
+        beat_idx = int(t / beat_len) % total_beats
+        t_in_beat = t % beat_len
+        drum = (math.sin(2 * math.pi * 60 * t)) * math.exp(-12 * t_in_beat) * (0.5 if beat_idx % 4 == 0 else 0.2)
+        freq = melody[beat_idx]
+        flute = (math.sin(2 * math.pi * freq * t)) * math.sin(math.pi * (t_in_beat / beat_len)) * 0.25 if freq > 0 else 0
+        buf[i] = int(max(-1.0, min(1.0, (drum + flute) * 0.6)) * 32767)
+    return buf.tobytes()
+
+
+def timed(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def startup_set(sfx_fn, theme_fn):
+    def run():
+        for k in audio.SFX_KINDS: sfx_fn(k)
+        for s in THEME_SPEEDS: theme_fn(s)
+    return run
+
+
+def main():
+    results = [("legacy per-sample loop", timed(startup_set(legacy_sfx, legacy_theme)))]
+    results.append(("pure-python fallback", timed(startup_set(lambda k: audio.render_sfx(k, use_numpy=False), lambda s: audio.render_theme(s, use_numpy=False)))))
+    if audio.np is not None:
+        results.append(("numpy batch", timed(startup_set(lambda k: audio.render_sfx(k, use_numpy=True), lambda s: audio.render_theme(s, use_numpy=True)))))
+
+    tmp = tempfile.mkdtemp()
+    audio.CACHE_DIR = tmp
+    try:
+        results.append(("cache cold (render + write)", timed(startup_set(audio.sfx_pcm, audio.theme_pcm), repeats=1)))
+        results.append(("cache warm (load)", timed(startup_set(audio.sfx_pcm, audio.theme_pcm))))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    base = results[0][1]
+    for name, ms in results:
+        print(f"{name:<30} {ms:9.2f} ms  {base / ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+
+import collision
+import projectiles
+from projectiles import ProjectilePool
+
+# Stress test for the arrow/pickup update: the original dict + list.remove +
+# full pickup scan vs the struct-of-arrays pool with rect broad phase.
+
+W, H, FRAMES = 1280, 720, 300
+
+
+def make_mask(w, h):
+    s = pygame.Surface((w, h), pygame.SRCALPHA); s.fill((255, 255, 255, 255))
+    return s, pygame.mask.from_surface(s)
+
+
+def make_pickups(count, spacing):
+    img, mask = make_mask(40, 50)
+    return [{"img": img, "rect": pygame.Rect(200 + i * spacing, 450, 40, 50), "mask": mask, "active": True} for i in range(count)]
+
+
+def run_legacy(n_arrows, pickups, player_mask, arrow_img, arrow_mask):
+    rng = random.Random(1)
+    arrows, p_rect, camera_x, hits = [], pygame.Rect(400, 515, 60, 100), 0, 0
+    t0 = time.perf_counter()
+    for f in range(FRAMES):
+        camera_x += 8
+        while len(arrows) < n_arrows:
+            arrows.append({"img": arrow_img, "mask": arrow_mask, "pos": [rng.randint(int(camera_x), int(camera_x) + W), rng.randint(-100, H)], "vel": rng.uniform(6, 12)})
+        for a in arrows[:]:
+            a["pos"][1] += a["vel"]
+            if player_mask.overlap(a["mask"], ((a["pos"][0] - camera_x) - p_rect.x, a["pos"][1] - p_rect.y)):
+                hits += 1; arrows.remove(a)
+            elif a["pos"][1] > H: arrows.remove(a)
+        for p in pickups:
+            if p["active"] and player_mask.overlap(p["mask"], ((p["rect"].x - camera_x) - p_rect.x, p["rect"].y - p_rect.y)): hits += 1
+    return (time.perf_counter() - t0) * 1000 / FRAMES, hits
+
+
+def run_pool(n_arrows, pickups, player_mask, arrow_img, arrow_mask, use_numpy=None):
+    rng = random.Random(1)
+    pool, index = ProjectilePool([(arrow_img, arrow_mask)], use_numpy=use_numpy), collision.PickupIndex(pickups)
+    p_rect, camera_x, hits = pygame.Rect(400, 515, 60, 100), 0, 0
+    t0 = time.perf_counter()
+    for f in range(FRAMES):
+        camera_x += 8
+        while len(pool) < n_arrows:
+            pool.spawn(0, rng.randint(int(camera_x), int(camera_x) + W), rng.randint(-100, H), rng.uniform(6, 12))
+        hits += collision.step_arrows(pool, player_mask, p_rect, camera_x, H)
+        hits += len(collision.collide_pickups(index, player_mask, p_rect, -camera_x))
+    return (time.perf_counter() - t0) * 1000 / FRAMES, hits
+
+
+def main():
+    _, player_mask = make_mask(60, 100)
+    arrow_img, arrow_mask = make_mask(12, 70)
+    for n_arrows in (20, 100, 300, 1000, 3000):
+        pickups = make_pickups(9 * 40, 1073)
+        legacy_ms, legacy_hits = run_legacy(n_arrows, pickups, player_mask, arrow_img, arrow_mask)
+        row = f"{n_arrows:5d} arrows, {len(pickups)} pickups: original {legacy_ms:7.3f} ms/frame (hits {legacy_hits})"
+        for name, use_numpy in (("array", False), ("numpy", True)):
+            if use_numpy and projectiles.np is None: continue
+            for p in pickups: p["active"] = True
+            pool_ms, pool_hits = run_pool(n_arrows, pickups, player_mask, arrow_img, arrow_mask, use_numpy)
+            row += f"  {name} pool {pool_ms:7.3f} ms/frame ({legacy_ms / pool_ms:4.1f}x, hits {pool_hits})"
+        print(row)
+
+
+
+if __name__ == "__main__":
+    main()
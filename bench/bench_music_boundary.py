@@ -0,0 +1,104 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+
+import audio
+import music
+
+# Frame-time trace across loop boundaries: synchronous theme regeneration vs the
+# tiers pre-rendered by ThemeScheduler, with NumPy and with the pure-Python synth
+# (what a build without NumPy runs), always from a cold audio cache. Every frame
+# also does a fixed slice of Python work standing in for the game, so a render
+# thread holding the GIL shows up as longer frames. Pass a path as the first
+# argument to dump the trace as CSV.
+
+FRAMES, FRAME_BUDGET_MS = 1800, 1000 / 60
+BOUNDARIES = {f: i + 1 for i, f in enumerate(range(300, FRAMES, 300))}  # loops of ~5 s; real ones run longer
+FRAME_WORK = 20000  # loop iterations of stand-in game work per frame
+
+
+def game_work():
+    x = 0
+    for i in range(FRAME_WORK): x += i & 7
+    return x
+
+
+def run_sync():
+    current = pygame.mixer.Sound(buffer=audio.render_theme(1.0)); current.play(-1)
+    trace = []
+    for f in range(FRAMES):
+        t0 = time.perf_counter()
+        game_work()
+        if f in BOUNDARIES:
+            current.stop()
+            current = pygame.mixer.Sound(buffer=audio.render_theme(music.speed_for_loop(BOUNDARIES[f])))
+            current.play(loops=-1)
+        trace.append((time.perf_counter() - t0) * 1000)
+        time.sleep(max(0.0, FRAME_BUDGET_MS / 1000 - (time.perf_counter() - t0)))
+    current.stop()
+    return trace
+
+
+def run_scheduler(whole_ladder=False):
+    theme = music.ThemeScheduler(); theme.start(); theme.play()
+    # What the scheduler first did: queue every tier at startup
+    if whole_ladder:
+        for speed in music.TEMPO_LADDER: theme._jobs.put(speed)
+    trace = []
+    for f in range(FRAMES):
+        t0 = time.perf_counter()
+        game_work()
+        theme.update()
+        if f in BOUNDARIES: theme.set_loop(BOUNDARIES[f])
+        trace.append((time.perf_counter() - t0) * 1000)
+        time.sleep(max(0.0, FRAME_BUDGET_MS / 1000 - (time.perf_counter() - t0)))
+    theme.stop()
+    return trace
+
+
+def summarize(name, trace):
+    at_boundary = [trace[f] for f in BOUNDARIES]
+    ordered = sorted(trace)
+    p50 = ordered[len(ordered) // 2]
+    # Frames at least twice the median: mostly ones that waited for a render thread holding the GIL
+    print(f"{name:<24} p50 {p50:7.3f} ms  p99 {ordered[int(len(ordered) * 0.99)]:7.3f} ms  max {ordered[-1]:8.3f} ms  "
+          f"worst boundary {max(at_boundary):8.3f} ms  slowed {sum(t > 2 * p50 for t in trace):4}  over budget {sum(t > FRAME_BUDGET_MS for t in trace)}")
+
+
+def cold(run, numpy=True):
+    # A fresh cache directory per case, and optionally the synth without NumPy
+    tmp, np = tempfile.mkdtemp(), audio.np
+    audio.CACHE_DIR = tmp
+    if not numpy: audio.np = None
+    try:
+        return run()
+    finally:
+        audio.np = np
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    pygame.mixer.init(frequency=44100, size=-16, channels=2)
+    try:
+        traces = {"synchronous": cold(run_sync), "scheduler": cold(run_scheduler)}
+        traces["sync, no numpy"] = cold(run_sync, numpy=False)
+        traces["whole ladder, no numpy"] = cold(lambda: run_scheduler(whole_ladder=True), numpy=False)
+        traces["scheduler, no numpy"] = cold(run_scheduler, numpy=False)
+    finally:
+        pygame.mixer.quit()
+    for name, trace in traces.items(): summarize(name, trace)
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "w") as f:
+            f.write("frame,boundary," + ",".join(traces) + "\n")
+            for i in range(FRAMES):
+                f.write(f"{i},{int(i in BOUNDARIES)}," + ",".join(f"{t[i]:.4f}" for t in traces.values()) + "\n")
+
+
+if __name__ == "__main__":
+    main()
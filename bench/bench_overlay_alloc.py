@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+
+import fonts
+import overlays
+
+# Surface allocations and ms per frame for the overlays: the original
+# allocate-a-full-screen-layer-per-frame code vs the compositor.
+
+W, H, FRAMES = 1280, 720, 300
+created = [0]
+_Surface = pygame.Surface
+
+
+def counting_surface(*args, **kwargs):
+    created[0] += 1
+    return _Surface(*args, **kwargs)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((W, H))
+    texts = fonts.TextRenderer(None)
+    sub, btn, desc = texts.font(45), texts.font(35), texts.font(24)
+    L_HIT, R_HIT, J_HIT = pygame.Rect(50, H - 150, 100, 100), pygame.Rect(180, H - 150, 100, 100), pygame.Rect(W - 160, H - 160, 120, 120)
+    card_img = _Surface((300, 420)); card_img.fill((120, 90, 60))
+
+    def legacy_touch(f):
+        overlay_surf = pygame.Surface((W, H), pygame.SRCALPHA)
+        for rect, label, is_active in [(L_HIT, "<", f % 20 < 10), (R_HIT, ">", False), (J_HIT, "JUMP", f % 60 < 15)]:
+            color = (255, 220, 100, 180) if is_active else (255, 255, 255, 70)
+            draw_rect = rect.inflate(10, 10) if is_active else rect
+            pygame.draw.ellipse(overlay_surf, color, draw_rect, width=3)
+            pygame.draw.ellipse(overlay_surf, (color[0], color[1], color[2], 40), draw_rect)
+            lbl = texts.render(label, btn if label == "JUMP" else sub, color)
+            overlay_surf.blit(lbl, (draw_rect.centerx - lbl.get_width()//2, draw_rect.centery - lbl.get_height()//2))
+        screen.blit(overlay_surf, (0, 0))
+
+    def legacy_panel(alpha):
+        def draw(f):
+            overlay = pygame.Surface((W, H), pygame.SRCALPHA); overlay.fill((0, 0, 0, alpha)); screen.blit(overlay, (0, 0))
+            pygame.draw.rect(screen, (40, 30, 20), (W//2 - 350, 100, 700, 500), border_radius=15)
+            screen.blit(card_img, (W//2 - 320, 140))
+        return draw
+
+    compositor = overlays.Compositor((W, H))
+    pygame.Surface = counting_surface
+    touch = overlays.TouchButtons([(L_HIT, "<", sub), (R_HIT, ">", sub), (J_HIT, "JUMP", btn)], texts)
+
+    def draw_card(panel):
+        pygame.draw.rect(panel, (40, 30, 20), panel.get_rect(), border_radius=15)
+        panel.blit(card_img, (30, 40))
+
+    def new_touch(f):
+        touch.draw(screen, (f % 20 < 10, False, f % 60 < 15))
+
+    def new_panel(alpha):
+        def draw(f):
+            compositor.dim(screen, alpha)
+            screen.blit(compositor.layer(("card", alpha), (700, 500), draw_card), (W//2 - 350, 100))
+        return draw
+
+    cases = [("touch HUD", legacy_touch, new_touch)]
+    cases += [(f"panel a={a}", legacy_panel(a), new_panel(a)) for a in (150, 200, 220)]
+    for name, legacy, new in cases:
+        for label, draw in (("original", legacy), ("compositor", new)):
+            draw(0)  # warm-up frame builds any caches
+            created[0], misses = 0, texts.misses
+            t0 = time.perf_counter()
+            for f in range(FRAMES): draw(f)
+            ms = (time.perf_counter() - t0) * 1000 / FRAMES
+            print(f"{name:<12} {label:<11} {created[0] / FRAMES:5.2f} Surfaces/frame  {texts.misses - misses:3d} text renders  {ms:6.3f} ms/frame")
+    pygame.Surface = _Surface
+
+
+if __name__ == "__main__":
+    main()
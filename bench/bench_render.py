@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import pygame
+
+import render
+
+# ms per frame for the PLAYING scene: the original draw-everything path vs the
+# layered renderer, with the camera scrolling and with the camera still.
+
+W, H, FRAMES, ARROWS = 1280, 720, 300, 20
+
+
+def load(name, scale=True):
+    img = pygame.image.load(os.path.join(ROOT, name)).convert_alpha()
+    if not scale: return img
+    ratio = H / img.get_height()
+    return pygame.transform.scale(img, (int(img.get_width() * ratio), H))
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((W, H))
+    backdrop, background, front = load("Backdrop.png"), load("Background.png"), load("Front_Objects.png")
+    full_seal = pygame.transform.scale(load("fullhp.png", False), (60, 60))
+    empty_seal = pygame.transform.scale(load("hpdown.png", False), (60, 60))
+    icon = pygame.transform.scale(load("Seal.png", False), (60, 80))
+    arrow = pygame.Surface((12, 70), pygame.SRCALPHA); arrow.fill((200, 200, 200, 255))
+    font = pygame.font.Font(None, 45)
+    level_width = background.get_width()
+    scene = render.SceneRenderer(screen, backdrop, background, front, level_width)
+    hud = render.Hud(full_seal, empty_seal, 4, {"Seal": icon}, W)
+
+    def legacy(camera_x, arrows, score):
+        bg_off = camera_x % level_width
+        bd_off = (camera_x * 0.4) % backdrop.get_width()
+        for i in range(2):
+            bx = int(i * level_width - bg_off)
+            screen.blit(backdrop, (int(i * backdrop.get_width() - bd_off), 0))
+            screen.blit(background, (bx, 0))
+            if bx < W: screen.blit(background, (bx + level_width - 1, 0))
+        for x, y in arrows: screen.blit(arrow, (x, y))
+        for i in range(2): screen.blit(front, (int(i * level_width - bg_off), 0))
+        for i in range(4): screen.blit(full_seal if i < 3 else empty_seal, (30 + i * 70, 30))
+        screen.blit(icon, (W - 80, 20))
+        s = font.render(f"SCORE: {score}", True, (255, 255, 255)); screen.blit(s, (W - s.get_width() - 20, 110))
+        pygame.display.flip()
+
+    score_cache = {}
+    def layered(camera_x, arrows, score):
+        s = score_cache.get(score) or score_cache.setdefault(score, font.render(f"SCORE: {score}", True, (255, 255, 255)))
+        scene.mark(*hud.update(3, {"Seal": {}}, s))
+        scene.draw_scene(camera_x, [(arrow, pygame.Rect(x, y, 12, 70)) for x, y in arrows])
+        hud.draw(screen)
+        scene.present()
+
+    for moving in (True, False):
+        for name, draw in (("original", legacy), ("layered", layered)):
+            rng = random.Random(7)
+            arrows = [[rng.randint(0, W), rng.randint(-100, H)] for _ in range(ARROWS)]
+            cam, t0 = 2000.0, time.perf_counter()
+            for f in range(FRAMES):
+                if moving: cam += 8
+                for a in arrows: a[1] = (a[1] + 9) % (H + 100) - 100
+                draw(cam, arrows, 500 * (f // 100))
+            ms = (time.perf_counter() - t0) * 1000 / FRAMES
+            print(f"{'scrolling' if moving else 'still':<10} {name:<9} {ms:6.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
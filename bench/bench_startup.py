@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-process time to the first presented frame and peak RSS, with the asset
+# bundle disabled, on the run that bakes it, and with it warm; each both with
+# every asset loaded up front ("eager") and with the lazy manager as shipped.
+
+RUNS = 5
+CHILD = """
+import sys
+sys.path.insert(0, {root!r})
+import Main, assets
+game = Main.Game(1, None)
+if {eager}:
+    game.finish_loading()
+    for card in game.artifacts: card["card_img"].get()
+game.draw(0)
+print(f"{{game.first_frame_ms:.1f}} {{(assets.peak_rss() or 0) / 2**20:.1f}}")
+game.close_assets(wait=True)
+"""
+
+
+def run(bundle, eager=False):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", RUINS_ASSET_BUNDLE="1" if bundle else "0")
+    out = subprocess.run([sys.executable, "-c", CHILD.format(root=ROOT, eager=eager)], env=env, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    first, rss = out.split()[-2:]
+    return float(first), float(rss)
+
+
+def report(name, samples):
+    first = sorted(f for f, _ in samples)
+    rss = sorted(r for _, r in samples)
+    print(f"{name:>18}: first frame median {first[len(first) // 2]:7.1f} ms  peak RSS median {rss[len(rss) // 2]:6.1f} MB")
+
+
+def main():
+    sys.path.insert(0, ROOT)
+    import assets
+    cache = os.path.join(ROOT, assets.CACHE_DIR)
+    for name in os.listdir(cache) if os.path.isdir(cache) else []:
+        if name.startswith("bundle_"): os.remove(os.path.join(cache, name))
+    run(False)  # warm the audio and terrain caches so only asset loading differs
+    report("no bundle, eager", [run(False, True) for _ in range(RUNS)])
+    report("no bundle, lazy", [run(False) for _ in range(RUNS)])
+    t = time.perf_counter(); first, _ = run(True)
+    print(f"{'bake run':>18}: first frame {first:7.1f} ms  {(time.perf_counter() - t) * 1000:7.1f} ms wall including the background bake")
+    report("bundle, eager", [run(True, True) for _ in range(RUNS)])
+    report("bundle, lazy", [run(True) for _ in range(RUNS)])
+    size = sum(os.path.getsize(os.path.join(cache, n)) for n in os.listdir(cache) if n.startswith("bundle_"))
+    print(f"bundle size {size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
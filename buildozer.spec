@@ -15,11 +15,14 @@ source.dir = .
 # (list) Source files to include
 source.include_exts = py,png,jpg,ttf,wav,json
 
+# (list) List of directory to exclude (let empty to not exclude anything)
+source.exclude_dirs = bench, cache
+
 # (str) Application versioning
 version = 1.0.0
 
 # (list) Application requirements
-requirements = python3, pygame, pillow
+requirements = python3, pygame, pillow, numpy
 
 # (list) Supported orientations
 orientation = landscape
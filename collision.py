@@ -0,0 +1,41 @@
+import bisect
+
+# --- Collision Broad Phase ---
+# Cheap rect rejection first; pixel masks are only consulted for the few
+# candidates whose bounding boxes actually touch the player.
+
+
+class PickupIndex:
+    # Pickups sorted by level-local x, queried by the player's x-interval
+    def __init__(self, pickups):
+        self.pickups = sorted(pickups, key=lambda p: p["rect"].x)
+        self.lefts = [p["rect"].x for p in self.pickups]
+        self.max_w = max((p["rect"].w for p in self.pickups), default=0)
+
+    def query(self, left, right):
+        lo = bisect.bisect_left(self.lefts, left - self.max_w)
+        hi = bisect.bisect_left(self.lefts, right)
+        return [p for p in self.pickups[lo:hi] if p["rect"].right > left]
+
+
+def collide_pickups(index, mask, p_rect, offset_x):
+    # offset_x converts level-local pickup x into screen x; returns the active pickups touched
+    left = p_rect.x - offset_x
+    hits = []
+    for p in index.query(left, left + p_rect.w):
+        r = p["rect"]
+        if not p["active"] or r.bottom <= p_rect.y or r.y >= p_rect.bottom: continue
+        if mask.overlap(p["mask"], (r.x + offset_x - p_rect.x, r.y - p_rect.y)): hits.append(p)
+    return hits
+
+
+def step_arrows(pool, mask, p_rect, camera_x, kill_y):
+    # Moves every arrow, despawns hits and arrows past kill_y; returns the number of hits
+    pool.integrate()
+    px, py, hits = p_rect.x, p_rect.y, 0
+    # Descending order keeps pending indices valid across swap-removes
+    for i in reversed(pool.overlapping(px + camera_x, py, p_rect.right + camera_x, p_rect.bottom)):
+        if mask.overlap(pool.mask(i), (pool.x[i] - camera_x - px, pool.y[i] - py)):
+            hits += 1; pool.despawn(i)
+    pool.cull(kill_y)
+    return hits
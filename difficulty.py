@@ -0,0 +1,175 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+
+import Main
+import assets
+import music
+import simulation
+
+# --- Difficulty Simulator ---
+# Plays thousands of seeded sessions with a bot straight against World.step
+# (no window, renderer or mixer) across a process pool, then reports how
+# long sessions last, how far they get and how dense the arrows are per
+# loop next to the ramp values for that loop. Every session is a pure
+# function of (seed, bot, tick limit), so any outlier can be replayed.
+#
+#   python difficulty.py --sessions 2000 --bot dodger
+#   python difficulty.py --sessions 500 --bot runner --max-minutes 2 --json out.json
+
+HORIZON = 45  # ticks the dodger looks ahead
+PERCENTILES = (0.1, 0.5, 0.9, 0.99)
+
+_level = None
+
+
+def load_level():
+    # The same baked bundle the game uses; convert_alpha needs a (dummy) display
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    manager = assets.AssetManager((Main.SCREEN_WIDTH, Main.SCREEN_HEIGHT), [Main.resource_path(p) for p in Main.ASSET_SOURCES],
+                                  Main.ASSET_BUILDERS, use_bundle=os.environ.get("RUINS_ASSET_BUNDLE") != "0")
+    level = Main.build_level(manager.get, manager.get("level_width"))
+    manager.join()  # a bake started on a miss needs the display too
+    # Done with SDL; it would otherwise keep its SIGTERM handler and the pool could never stop the worker
+    pygame.display.quit()
+    return level
+
+
+def _init_worker():
+    global _level
+    _level = load_level()
+
+
+# --- Bots ---
+def runner(world):
+    # What headless.Bot does: hold right, jump on a fixed rhythm
+    return simulation.Input(True, False, world.ticks % 45 < 6, False)
+
+
+def _threat(world, rect, dx):
+    # True if an arrow would meet the player's box within HORIZON ticks while moving dx per tick
+    a = world.arrows
+    for i in range(a.n):
+        x, y, vel, w, h = a.x[i], a.y[i], a.vel[i], a.w[i], a.h[i]
+        start = max(0.0, (rect.top - (y + h)) / vel)
+        end = (rect.bottom - y) / vel
+        if end < 0 or start > HORIZON: continue
+        lo, hi = sorted((dx * start, dx * end))
+        if x < rect.right + hi and x + w > rect.left + lo: return True
+    return False
+
+
+def dodger(world):
+    # Runs right unless that walks under an arrow; otherwise waits, backs off, or runs anyway
+    speed = simulation.run_speed(world.loop_count)
+    rect = world.anim.pose(world.anim_idx, world.player_direction, world.player_x, world.player_y)[2]
+    for right, left in ((True, False), (False, False), (False, True)):
+        if not _threat(world, rect, speed if right else -speed if left else 0):
+            jump = right and world.is_grounded and world.ticks % 90 == 0
+            return simulation.Input(right, left, jump, False)
+    return simulation.Input(True, False, False, False)
+
+
+BOTS = {"runner": runner, "dodger": dodger}
+
+
+def run_session(job):
+    seed, bot, max_ticks = job
+    play = BOTS[bot]
+    world = simulation.World(_level, seed)
+    t0 = time.process_time()
+    # Per loop: ticks spent, arrows spawned, hits taken
+    loops = [[0, 0, 0]]
+    peak_arrows = 0
+    while not world.over and world.ticks < max_ticks:
+        events = world.step(play(world))
+        cur = loops[-1]
+        cur[0] += 1
+        for e in events:
+            if e == "whoosh": cur[1] += 1
+            elif e == "hit": cur[2] += 1
+            elif e == "loop": loops.append([0, 0, 0])
+        peak_arrows = max(peak_arrows, world.arrows.n)
+    return {"seed": seed, "ticks": world.ticks, "loops": world.loop_count, "score": world.total_score,
+            "over": world.over, "fell": world.fell, "peak_arrows": peak_arrows, "per_loop": loops,
+            "cpu_s": time.process_time() - t0}
+
+
+# --- Report ---
+def distribution(values):
+    values = sorted(values)
+    if not values: return {}
+    out = {f"p{round(q * 100)}": values[min(len(values) - 1, int(len(values) * q))] for q in PERCENTILES}
+    out.update(mean=sum(values) / len(values), max=values[-1])
+    return out
+
+
+def summarise(results, wall, workers):
+    tps = simulation.TICK_RATE
+    ticks = sum(r["ticks"] for r in results)
+    cpu = sum(r["cpu_s"] for r in results)
+    out = {"sessions": len(results), "workers": workers, "wall_s": wall, "ticks": ticks,
+           "ticks_per_s_per_core": ticks / wall / workers, "ticks_per_cpu_s": ticks / cpu if cpu else 0.0,
+           "timed_out": sum(not r["over"] for r in results), "fell": sum(r["fell"] for r in results),
+           "survival_s": distribution([r["ticks"] / tps for r in results]),
+           "loops": distribution([r["loops"] for r in results]),
+           "score": distribution([r["score"] for r in results]),
+           "arrows_per_s": distribution([sum(l[1] for l in r["per_loop"]) * tps / max(1, r["ticks"]) for r in results]),
+           "peak_arrows": distribution([r["peak_arrows"] for r in results]),
+           "per_loop": []}
+    for loop in range(max((r["loops"] for r in results), default=0) + 1):
+        rows = [r["per_loop"][loop] for r in results if len(r["per_loop"]) > loop]
+        t = sum(row[0] for row in rows)
+        low, high = simulation.spawn_delay_range(loop)
+        out["per_loop"].append({"loop": loop, "sessions": len(rows), "mean_s": t / tps / len(rows),
+                                "arrows_per_s": sum(row[1] for row in rows) * tps / max(1, t), "hits_per_min": sum(row[2] for row in rows) * tps * 60 / max(1, t),
+                                "run_speed": simulation.run_speed(loop), "arrow_speed": simulation.arrow_speed(loop),
+                                "spawn_delay_ms": [low, high], "music_speed": music.speed_for_loop(loop)})
+    return out
+
+
+def report(s):
+    print(f"{s['sessions']} sessions on {s['workers']} workers in {s['wall_s']:.1f} s: {s['ticks']} ticks, "
+          f"{s['ticks_per_s_per_core']:.0f} ticks/s per core ({s['ticks_per_cpu_s']:.0f} per CPU second)")
+    print(f"game over {s['sessions'] - s['timed_out']} (fell {s['fell']}), still alive at the tick limit {s['timed_out']}")
+    for name in ("survival_s", "loops", "score", "arrows_per_s", "peak_arrows"):
+        d = s[name]
+        print(f"{name:>13}  " + "  ".join(f"{k} {v:.1f}" if isinstance(v, float) else f"{k} {v}" for k, v in d.items()))
+    print(" loop  sessions  mean s  arrows/s  hits/min  run  arrow v  spawn ms   music")
+    for row in s["per_loop"]:
+        print(f"{row['loop']:>5}  {row['sessions']:>8}  {row['mean_s']:>6.1f}  {row['arrows_per_s']:>8.2f}  {row['hits_per_min']:>8.2f}  "
+              f"{row['run_speed']:>3.1f}  {row['arrow_speed']:>7.1f}  {row['spawn_delay_ms'][0]:>4}-{row['spawn_delay_ms'][1]:<4}  {row['music_speed']:>4.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many bot sessions to evaluate the difficulty ramps")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="first seed; sessions use seed, seed + 1, ...")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="dodger")
+    parser.add_argument("--max-minutes", type=float, default=5.0, help="game time after which a session is cut off")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", metavar="PATH", help="write the summary as JSON")
+    args = parser.parse_args(argv)
+    # Bake (or check) the bundle once here so the workers only ever read it
+    load_level()
+    max_ticks = int(args.max_minutes * 60 * simulation.TICK_RATE)
+    jobs = [(args.seed + i, args.bot, max_ticks) for i in range(args.sessions)]
+    t = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(args.workers, initializer=_init_worker) as pool:
+        results = pool.map(run_session, jobs, chunksize=max(1, len(jobs) // (args.workers * 8)))
+    summary = summarise(results, time.perf_counter() - t, args.workers)
+    report(summary)
+    if args.json:
+        with open(args.json, "w") as f: json.dump(summary, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+import pygame
+
+# --- Font & Text Render Cache ---
+# Each font size is opened once; rendered strings (plain and outlined) live in
+# a bounded LRU so static labels are rasterised a single time.
+
+OUTLINE_OFFSETS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+class TextRenderer:
+    def __init__(self, font_path, max_entries=256):
+        self.font_path = font_path
+        self.max_entries = max_entries
+        self._fonts = {}
+        self._surfs = OrderedDict()
+        self._wraps = {}
+        self.hits = self.misses = 0
+
+    def font(self, size):
+        f = self._fonts.get(size)
+        if f is None:
+            try: f = pygame.font.Font(self.font_path, size)
+            except Exception: f = pygame.font.SysFont("monospace", size, bold=True)
+            self._fonts[size] = f
+        return f
+
+    def _lookup(self, key, build):
+        surf = self._surfs.get(key)
+        if surf is not None:
+            self._surfs.move_to_end(key); self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self._surfs[key] = build()
+        if len(self._surfs) > self.max_entries: self._surfs.popitem(last=False)
+        return surf
+
+    def wrap(self, text, font, max_width):
+        key = (text, font, max_width)
+        lines = self._wraps.get(key)
+        if lines is None:
+            lines, line = [], ""
+            for word in text.split(' '):
+                if font.size(line + word)[0] < max_width: line += word + " "
+                else: lines.append(line); line = word + " "
+            lines.append(line)
+            self._wraps[key] = lines
+        return lines
+
+    def render(self, text, font, colour):
+        return self._lookup((text, font, tuple(colour)), lambda: font.render(text, True, colour))
+
+    def outlined(self, text, font, text_col, shadow_col, thickness=4):
+        key = (text, font, tuple(text_col), tuple(shadow_col), thickness)
+        return self._lookup(key, lambda: self._compose_outline(text, font, text_col, shadow_col, thickness))
+
+    def _compose_outline(self, text, font, text_col, shadow_col, thickness):
+        # One shadow render stamped at every offset, then the face on top
+        pad = max(1, thickness)
+        shadow, face = font.render(text, True, shadow_col), font.render(text, True, text_col)
+        surf = pygame.Surface((face.get_width() + 2 * pad, face.get_height() + 2 * pad), pygame.SRCALPHA)
+        offsets = OUTLINE_OFFSETS + [(0, -thickness), (0, thickness), (-thickness, 0), (thickness, 0)]
+        for dx, dy in offsets: surf.blit(shadow, (pad + dx, pad + dy))
+        surf.blit(face, (pad, pad))
+        return surf
+
+    def draw_outlined(self, surf, text, font, pos, text_col, shadow_col, thickness=4, center=False, right=False):
+        img = self.outlined(text, font, text_col, shadow_col, thickness)
+        pad = max(1, thickness)
+        tw = img.get_width() - 2 * pad
+        if center: x = pos[0] - tw // 2
+        elif right: x = pos[0] - tw
+        else: x = pos[0]
+        surf.blit(img, (x - pad, pos[1] - pad))
+
+
+class DynamicText:
+    # For strings that change during play (score); re-rendered only when the value moves
+    def __init__(self, font, colour):
+        self.font, self.colour = font, colour
+        self.text, self.surf = None, None
+
+    def get(self, text):
+        if text != self.text:
+            self.text, self.surf = text, self.font.render(text, True, self.colour)
+        return self.surf
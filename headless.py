@@ -0,0 +1,142 @@
+import argparse
+import os
+import sys
+import time
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+import pygame
+
+import Main
+import assets
+import inputlog
+import profiler
+
+# --- Headless Runner ---
+# Runs the full game (events, simulation, rendering) on SDL's dummy drivers
+# with a fixed seed, either driven by a scripted bot or by replaying a log
+# recorded with `Main.py --record` / `headless.py --record`. Frame time comes
+# from the log, never the wall clock, so every run of a log is identical.
+#
+#   python headless.py --frames 3600 --record run.bin
+#   python headless.py --replay run.bin
+
+BOT_FRAME_MS = (17, 17, 16)  # averages one 60 Hz tick per frame
+
+
+def finger(kind, x, y):
+    return pygame.event.Event(kind, x=x / Main.SCREEN_WIDTH, y=y / Main.SCREEN_HEIGHT, dx=0.0, dy=0.0, finger_id=0, touch_id=0, pressure=1.0)
+
+
+class Bot:
+    # Starts a session, runs right jumping on a rhythm, taps the touch jump now and then, repeats after game over
+    def __init__(self):
+        self.sessions = 0
+
+    def __call__(self, frame, game):
+        keys, events = (False, False, False), []
+        if game.game_state == "MENU":
+            if frame % 20 == 0: events.append(finger(pygame.FINGERDOWN, Main.SCREEN_WIDTH // 2 - 240, 410))
+        elif game.game_state == "NAMING":
+            self.sessions += 1
+            events += [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_BACKSPACE, unicode="\b", mod=0, scancode=0) for _ in game.player_name]
+            for ch in f"bot{self.sessions}": events.append(pygame.event.Event(pygame.KEYDOWN, key=ord(ch), unicode=ch, mod=0, scancode=0))
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r", mod=0, scancode=0))
+        elif game.game_state == "PLAYING":
+            keys = (True, False, frame % 45 < 6)
+            if frame % 97 == 50: events.append(finger(pygame.FINGERDOWN, *Main.J_HIT.center))
+            if frame % 97 == 52: events.append(finger(pygame.FINGERUP, *Main.J_HIT.center))
+        elif game.game_state == "GAMEOVER":
+            if frame % 60 == 0: events.append(finger(pygame.FINGERDOWN, 640, 360))
+        return keys, events
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def run(game, frames, log=None):
+    # frames: iterable of (frame_ms, keys, events); when log is given each frame is recorded first
+    state = inputlog.StateHash()
+    update_ms, render_ms, clock_ms = [], [], 0
+    t_start = time.perf_counter()
+    for frame_ms, keys, events in frames:
+        if log is not None: frame_ms, keys, events = log.add(frame_ms, keys, events)
+        game.prof.begin_frame()
+        t0 = time.perf_counter()
+        for event in events: game.handle_event(event)
+        game.prof.lap("events")
+        game.update(frame_ms, keys)
+        game.prof.lap("logic")
+        t1 = time.perf_counter()
+        clock_ms += frame_ms
+        game.draw(clock_ms)
+        t2 = time.perf_counter()
+        game.prof.end_frame(len(game.world.arrows) if game.world else 0)
+        update_ms.append((t1 - t0) * 1000); render_ms.append((t2 - t1) * 1000)
+        state.update(game)
+        if not game.running: break
+    wall = time.perf_counter() - t_start
+    return state, update_ms, render_ms, wall
+
+
+def bot_frames(game, count):
+    bot = Bot()
+    for f in range(count):
+        keys, events = bot(f, game)
+        yield BOT_FRAME_MS[f % len(BOT_FRAME_MS)], keys, events
+
+
+def report(game, state, update_ms, render_ms, wall):
+    w, a, rss = game.world, game.assets, assets.peak_rss()
+    print(f"frames {len(update_ms)}  ticks {game.ticks}  wall {wall:.2f} s  ticks/s {game.ticks / wall:.1f}")
+    print(f"update  p50 {percentile(update_ms, 0.5):.3f} ms  p99 {percentile(update_ms, 0.99):.3f} ms")
+    print(f"render  p50 {percentile(render_ms, 0.5):.3f} ms  p99 {percentile(render_ms, 0.99):.3f} ms  scale {game.render_scale}{' (auto)' if game.dynamic_scale else ''}")
+    print(f"first frame {game.first_frame_ms:.0f} ms  peak RSS {f'{rss / 2**20:.0f} MB' if rss else 'n/a'}  "
+          f"assets loaded {a.loads} evicted {a.evictions} resident {a.resident / 2**20:.1f} MB (peak {a.peak / 2**20:.1f} MB)")
+    v = game.voices
+    print(f"sfx triggers {v.triggers}  started {v.started}  merged {v.merged}  stolen {v.stolen}  dropped {v.dropped}")
+    print(f"total_score {w.total_score if w else 0}  loop_count {w.loop_count if w else 0}  state {state.digest().hex()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Ruins of Sindh headless and deterministically")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recorded input log and verify it")
+    parser.add_argument("--record", metavar="PATH", help="save the bot's inputs as a log")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--profile-out", metavar="PATH", help="write per-phase profiler stats (.json or .csv)")
+    parser.add_argument("--render-scale", metavar="SCALE", help='scene resolution, e.g. 0.5, or "auto"')
+    args = parser.parse_args(argv)
+    prof = profiler.Profiler(bool(args.profile_out), args.profile_out)
+
+    if args.replay:
+        log = inputlog.InputLog.load(args.replay)
+        game = Main.Game(log.seed, leaderboard_path=None, prof=prof, render_scale=args.render_scale)
+        state, update_ms, render_ms, wall = run(game, log)
+        report(game, state, update_ms, render_ms, wall)
+        prof.dump()
+        replayed = inputlog.InputLog(log.seed)
+        replayed.finish(game, state)
+        ok = log.result == replayed.result
+        print("replay bit-identical" if ok else f"replay MISMATCH: recorded {log.result[:3]} {log.result[3].hex()}")
+        game.close_assets(wait=True)
+        return 0 if ok else 1
+
+    game = Main.Game(args.seed, leaderboard_path=None, prof=prof, render_scale=args.render_scale)
+    log = inputlog.InputLog(args.seed) if args.record else None
+    state, update_ms, render_ms, wall = run(game, bot_frames(game, args.frames), log)
+    report(game, state, update_ms, render_ms, wall)
+    prof.dump()
+    if log is not None:
+        log.finish(game, state); log.save(args.record)
+        print(f"recorded {len(log)} frames to {args.record} ({os.path.getsize(args.record)} bytes)")
+    game.close_assets(wait=True)
+    return 0
+
+
+if __name__ == "__main__":
+    code = main()
+    pygame.quit()
+    sys.exit(code)
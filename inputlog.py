@@ -0,0 +1,125 @@
+import hashlib
+import struct
+
+import pygame
+
+# --- Input Log ---
+# A session is its seed plus, per frame, the frame time, held keys and the
+# handful of events the game reacts to. Each frame is two little-endian
+# bytes (ms, then key bits | event count << 3) followed by its events, so a
+# minute of play without touches is about 7 KB. The footer
+# keeps the final tick count, score, loop and a hash of every frame's world
+# state so a replay can prove it was bit-identical.
+
+MAGIC = b"RSIN1"
+KEY_RIGHT, KEY_LEFT, KEY_JUMP = 1, 2, 4
+
+_HEADER = struct.Struct("<qHI")    # seed, tick rate, frame count
+_FRAME = struct.Struct("<BB")      # frame ms, key bits | event count << 3
+MAX_EVENTS = 31                    # per frame; the rest are dropped while recording
+_FOOTER = struct.Struct("<Iii20s")  # ticks, total_score, loop_count, state hash
+_KEY = struct.Struct("<IB")        # key, unicode byte length
+_FINGER = struct.Struct("<ff")     # normalised x, y (SDL reports float32)
+_MOUSE = struct.Struct("<hhB")     # x, y, button
+
+_CODES = {pygame.QUIT: 0, pygame.KEYDOWN: 1, pygame.FINGERDOWN: 2, pygame.FINGERUP: 3,
+          pygame.MOUSEBUTTONDOWN: 4, pygame.MOUSEBUTTONUP: 5}
+_TYPES = {code: t for t, code in _CODES.items()}
+
+
+def encode_event(e):
+    code = _CODES[e.type]
+    if code == 1:
+        text = e.unicode.encode("utf-8")[:255]
+        return bytes([code]) + _KEY.pack(e.key, len(text)) + text
+    if code in (2, 3): return bytes([code]) + _FINGER.pack(e.x, e.y)
+    if code in (4, 5): return bytes([code]) + _MOUSE.pack(e.pos[0], e.pos[1], e.button)
+    return bytes([code])
+
+
+def decode_events(data, count, i=0):
+    events = []
+    for _ in range(count):
+        code = data[i]; i += 1
+        if code == 1:
+            key, n = _KEY.unpack_from(data, i); i += _KEY.size
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=data[i:i + n].decode("utf-8"), mod=0, scancode=0)); i += n
+        elif code in (2, 3):
+            x, y = _FINGER.unpack_from(data, i); i += _FINGER.size
+            events.append(pygame.event.Event(_TYPES[code], x=x, y=y, dx=0.0, dy=0.0, finger_id=0, touch_id=0, pressure=1.0))
+        elif code in (4, 5):
+            x, y, button = _MOUSE.unpack_from(data, i); i += _MOUSE.size
+            events.append(pygame.event.Event(_TYPES[code], pos=(x, y), button=button))
+        else:
+            events.append(pygame.event.Event(_TYPES[code]))
+    return events, i
+
+
+def key_bits(keys):
+    return (KEY_RIGHT if keys[0] else 0) | (KEY_LEFT if keys[1] else 0) | (KEY_JUMP if keys[2] else 0)
+
+
+def bits_keys(bits):
+    return (bool(bits & KEY_RIGHT), bool(bits & KEY_LEFT), bool(bits & KEY_JUMP))
+
+
+class StateHash:
+    # Running SHA-1 over World.snapshot() after every frame
+    def __init__(self):
+        self._h = hashlib.sha1()
+
+    def update(self, game):
+        # Outside play only the state name counts: when streaming builds the world
+        # depends on the machine's load speed, not on the inputs
+        playing = game.game_state in ("PLAYING", "GAMEOVER")
+        self._h.update(repr(game.world.snapshot() if playing else game.game_state).encode())
+
+    def digest(self):
+        return self._h.digest()
+
+
+class InputLog:
+    def __init__(self, seed, tick_rate=60):
+        self.seed, self.tick_rate = seed, tick_rate
+        self.frames = []    # (frame_ms, key bits, event count, encoded events)
+        self.result = None  # (ticks, total_score, loop_count, state hash)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def add(self, frame_ms, keys, events):
+        # Returns the frame exactly as a replay will see it (clamped ms, float32 touches),
+        # so the recording session runs on the same values it stores
+        kept = [encode_event(e) for e in events if e.type in _CODES][:MAX_EVENTS]
+        frame = (min(int(frame_ms), 255), key_bits(keys), len(kept), b"".join(kept))
+        self.frames.append(frame)
+        return frame[0], bits_keys(frame[1]), decode_events(frame[3], frame[2])[0]
+
+    def __iter__(self):
+        for frame_ms, bits, count, data in self.frames:
+            yield frame_ms, bits_keys(bits), decode_events(data, count)[0]
+
+    def finish(self, game, state):
+        w = game.world
+        self.result = (game.ticks, w.total_score if w else 0, w.loop_count if w else 0, state.digest())
+
+    # --- Disk format ---
+    def save(self, path):
+        out = [MAGIC, _HEADER.pack(self.seed, self.tick_rate, len(self.frames))]
+        for frame_ms, bits, count, data in self.frames: out += [_FRAME.pack(frame_ms, bits | count << 3), data]
+        out.append(_FOOTER.pack(*self.result) if self.result else _FOOTER.pack(0, 0, 0, bytes(20)))
+        with open(path, "wb") as f: f.write(b"".join(out))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f: data = f.read()
+        if not data.startswith(MAGIC): raise ValueError(f"{path}: not an input log")
+        seed, tick_rate, frames = _HEADER.unpack_from(data, len(MAGIC))
+        log, i = cls(seed, tick_rate), len(MAGIC) + _HEADER.size
+        for _ in range(frames):
+            frame_ms, packed = _FRAME.unpack_from(data, i); i += _FRAME.size
+            count = packed >> 3
+            _, end = decode_events(data, count, i)
+            log.frames.append((frame_ms, packed & 7, count, data[i:end])); i = end
+        log.result = _FOOTER.unpack_from(data, i)
+        return log
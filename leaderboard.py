@@ -0,0 +1,111 @@
+import bisect
+import json
+import os
+import threading
+
+# --- Leaderboard Store ---
+# Loaded once and kept sorted in memory; saves are atomic (temp file + rename)
+# and happen on a background writer so the game loop never touches the disk.
+
+MAX_ENTRIES = 100
+PAGE_SIZE = 5
+
+
+class Leaderboard:
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = []
+        self._keys = []
+        self._best = {}
+        self.version = 0
+        self._dirty = threading.Event()
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._writer = None
+        self._load()
+
+    def _load(self):
+        if self.path is None: return  # in-memory only (recordings, simulations)
+        try:
+            with open(self.path, "r") as f: data = json.load(f)
+        except (OSError, ValueError):
+            data = []
+        for e in data if isinstance(data, list) else []:
+            try: self._insert(str(e["name"]), int(e["score"]))
+            except (KeyError, TypeError, ValueError): pass
+        self._trim()
+
+    def _insert(self, name, score):
+        # Keys are negated scores so the list stays descending; ties keep arrival order
+        i = bisect.bisect_right(self._keys, -score)
+        self._keys.insert(i, -score)
+        self.entries.insert(i, {"name": name, "score": score})
+        key = name.strip().lower()
+        if score > self._best.get(key, -1): self._best[key] = score
+
+    def _trim(self):
+        if len(self.entries) > self.max_entries:
+            del self.entries[self.max_entries:], self._keys[self.max_entries:]
+            self._best = {}
+            for e in self.entries:
+                key = e["name"].strip().lower()
+                if e["score"] > self._best.get(key, -1): self._best[key] = e["score"]
+
+    # --- Queries (no I/O) ---
+    def top_score(self):
+        return self.entries[0]["score"] if self.entries else None
+
+    def is_new_best(self, score):
+        return not self.entries or score > self.entries[0]["score"]
+
+    def is_name_taken(self, name):
+        return name.strip().lower() in self._best
+
+    def player_best(self, name):
+        return self._best.get(name.strip().lower())
+
+    def page(self, index=0, per_page=PAGE_SIZE):
+        return self.entries[index * per_page:(index + 1) * per_page]
+
+    def page_count(self, per_page=PAGE_SIZE):
+        return max(1, -(-len(self.entries) // per_page))
+
+    # --- Updates ---
+    def add(self, name, score):
+        with self._lock:
+            self._insert(name, score)
+            self._trim()
+            self.version += 1
+        self._schedule_save()
+
+    def _schedule_save(self):
+        if self.path is None: return
+        self._dirty.set()
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="leaderboard-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            self._write()
+
+    def _write(self):
+        tmp = f"{self.path}.tmp"
+        with self._io_lock:
+            with self._lock: snapshot = [dict(e) for e in self.entries]
+            try:
+                with open(tmp, "w") as f:
+                    json.dump(snapshot, f)
+                    f.flush(); os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
+
+    def flush(self):
+        # Called on exit so a score saved in the last frame still lands on disk
+        if self._writer is not None:
+            self._dirty.clear()
+            self._write()
@@ -0,0 +1,87 @@
+import queue
+import threading
+
+import pygame
+
+import audio
+
+# --- Adaptive Theme Scheduler ---
+# Tempo tiers are rendered on a worker thread one loop ahead of the game, so
+# a loop boundary only swaps which pre-built Sound is playing. Only the next
+# tier is rendered, not the whole ladder: without NumPy a tier is a few
+# hundred ms of Python that competes with the game loop for the GIL.
+
+SPEED_STEP, MAX_SPEED = 0.08, 1.8
+CROSSFADE_MS = 300
+
+
+def speed_for_loop(loop):
+    return round(min(1.0 + (loop * SPEED_STEP), MAX_SPEED), 2)
+
+
+TEMPO_LADDER = sorted({speed_for_loop(i) for i in range(int((MAX_SPEED - 1.0) / SPEED_STEP) + 2)})
+
+
+class ThemeScheduler:
+    def __init__(self, crossfade_ms=CROSSFADE_MS):
+        self.crossfade_ms = crossfade_ms
+        self._pcm = {}
+        self._sounds = {}
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._worker = None
+        self.speed = speed_for_loop(0)
+        self.target = self.speed
+        self.playing = False
+        # The base tier has to be ready before the first frame, everything else can wait
+        self._pcm[self.speed] = audio.theme_pcm(self.speed)
+        self.current = self._sound(self.speed)
+
+    def start(self):
+        if self._worker: return
+        self._jobs.put(speed_for_loop(1))
+        self._worker = threading.Thread(target=self._render_jobs, name="theme-prerender", daemon=True)
+        self._worker.start()
+
+    def _render_jobs(self):
+        while True:
+            speed = self._jobs.get()
+            with self._lock:
+                if speed in self._pcm: continue
+            pcm = audio.theme_pcm(speed)
+            with self._lock: self._pcm[speed] = pcm
+
+    def is_ready(self, speed):
+        with self._lock: return speed in self._pcm
+
+    def _sound(self, speed):
+        # Sounds are built on the main thread; wrapping ready PCM is a plain copy
+        snd = self._sounds.get(speed)
+        if snd is None:
+            with self._lock: pcm = self._pcm[speed]
+            snd = self._sounds[speed] = pygame.mixer.Sound(buffer=pcm)
+        return snd
+
+    def set_loop(self, loop, play=True):
+        self.target = speed_for_loop(loop)
+        # The tier for this loop if it isn't ready yet (a skipped loop), then the one after it
+        for speed in (self.target, speed_for_loop(loop + 1)):
+            if not self.is_ready(speed): self._jobs.put(speed)
+        self.update(play)
+
+    def update(self, play=None):
+        if play is None: play = self.playing
+        if self.target != self.speed and self.is_ready(self.target):
+            new = self._sound(self.target)
+            if self.playing:
+                self.current.fadeout(self.crossfade_ms)
+                new.play(loops=-1, fade_ms=self.crossfade_ms)
+            self.current, self.speed = new, self.target
+        if play and not self.playing: self.play()
+        elif not play and self.playing: self.stop()
+
+    def play(self):
+        self.current.play(loops=-1); self.playing = True
+
+    def stop(self):
+        self.current.stop(); self.playing = False
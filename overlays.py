@@ -0,0 +1,95 @@
+import pygame
+
+# --- Overlay Compositor ---
+# Translucent full-screen panels and touch-button states are built once and
+# only blitted afterwards, so overlays allocate nothing in steady state.
+# Vignettes are nested rings of flat colour, each drawn as four edge strips
+# with surface alpha: nothing is blended in the untouched middle, and a
+# pulse only changes the alpha handed to each ring.
+
+
+class Compositor:
+    def __init__(self, size):
+        self.size = size
+        self._shades = {}
+        self._layers = {}
+
+    def shade(self, alpha, colour=(0, 0, 0)):
+        # A flat colour with surface alpha blends like a per-pixel SRCALPHA fill, but much cheaper
+        key = (alpha, colour)
+        s = self._shades.get(key)
+        if s is None:
+            s = self._shades[key] = pygame.Surface(self.size).convert()
+            s.fill(colour); s.set_alpha(alpha)
+        return s
+
+    def dim(self, surf, alpha, colour=(0, 0, 0)):
+        surf.blit(self.shade(alpha, colour), (0, 0))
+
+    def vignette(self, colour, depth=180, max_alpha=190):
+        key = ("vignette", colour, depth, max_alpha)
+        v = self._layers.get(key)
+        if v is None: v = self._layers[key] = Vignette(self.size, colour, depth, max_alpha)
+        return v
+
+    def layer(self, key, size, draw):
+        # Cached SRCALPHA surface; draw(surface) runs only the first time a key is seen
+        s = self._layers.get(key)
+        if s is None:
+            s = self._layers[key] = pygame.Surface(size, pygame.SRCALPHA)
+            draw(s)
+        return s
+
+
+class Vignette:
+    def __init__(self, size, colour, depth=180, max_alpha=190, ring=4):
+        # Ring d (from the edge inwards) has alpha (1 - d / depth) * max_alpha
+        w, h = size
+        self.ring = ring
+        self._h, self._v = pygame.Surface((w, ring)).convert(), pygame.Surface((ring, h)).convert()
+        self._h.fill(colour); self._v.fill(colour)
+        self.rings = []
+        for d in range(0, depth, ring):
+            inner = d + ring
+            self.rings.append((max(0.0, (1 - d / depth) * max_alpha),
+                               pygame.Rect(d, d, w - 2 * d, ring), pygame.Rect(d, h - inner, w - 2 * d, ring),
+                               pygame.Rect(d, inner, ring, h - 2 * inner), pygame.Rect(w - inner, inner, ring, h - 2 * inner)))
+
+    def draw(self, surf, strength=1.0):
+        # strength scales every ring, like set_alpha on a baked SRCALPHA vignette
+        hs, vs, ring = self._h, self._v, self.ring
+        for alpha, top, bottom, left, right in self.rings:
+            a = int(alpha * strength)
+            if a <= 0: continue
+            hs.set_alpha(a); vs.set_alpha(a)
+            surf.blit(hs, top, (0, 0, top.w, ring)); surf.blit(hs, bottom, (0, 0, bottom.w, ring))
+            surf.blit(vs, left, (0, 0, ring, left.h)); surf.blit(vs, right, (0, 0, ring, right.h))
+
+
+class TouchButtons:
+    # Each button is pre-rendered idle and active (pressed, or airborne for jump)
+    IDLE, ACTIVE = (255, 255, 255, 70), (255, 220, 100, 180)
+
+    def __init__(self, buttons, texts):
+        self.buttons = []
+        for rect, label, font in buttons:
+            states = []
+            for is_active in (False, True):
+                colour = self.ACTIVE if is_active else self.IDLE
+                draw_rect = rect.inflate(10, 10) if is_active else rect
+                img = pygame.Surface(draw_rect.size, pygame.SRCALPHA)
+                local = img.get_rect()
+                pygame.draw.ellipse(img, colour, local, width=3)
+                pygame.draw.ellipse(img, (colour[0], colour[1], colour[2], 40), local)
+                lbl = texts.render(label, font, colour)
+                img.blit(lbl, (local.centerx - lbl.get_width()//2, local.centery - lbl.get_height()//2))
+                states.append((img, draw_rect.topleft))
+            self.buttons.append(states)
+
+    def regions(self):
+        return [pygame.Rect(pos, img.get_size()) for states in self.buttons for img, pos in states[1:]]
+
+    def draw(self, surf, active):
+        for states, is_active in zip(self.buttons, active):
+            img, pos = states[is_active]
+            surf.blit(img, pos)
@@ -0,0 +1,206 @@
+import bisect
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+import pygame.sysfont
+
+# --- Frame Profiler ---
+# lap(name) charges the time since the previous lap to a named section of the
+# current frame; World and SceneRenderer call it between their phases. When
+# disabled, lap is a no-op function and no hooks are installed, so the cost
+# is one call per section. When enabled, pygame's Surface/transform/font
+# factories and Sound.play are wrapped to count allocations and triggers.
+
+SECTIONS = ["events",
+            "logic.move", "logic.ground", "logic.anim", "logic.spawn", "logic.arrows", "logic.pickups", "logic",
+            "render.prep", "render.parallax", "render.sprites", "render.upscale", "render.hud", "render.overlays", "render.touch", "render.menu",
+            "profiler", "flip"]
+COUNTERS = ["surfaces", "sounds"]
+BUCKETS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3, 66.7]
+GROUPS = [("events", (150, 150, 150)), ("logic", (90, 200, 90)), ("render", (80, 140, 255)), ("profiler", (200, 90, 200)), ("flip", (255, 160, 60))]
+GRAPH_SIZE, GRAPH_MS = (240, 100), 33.3
+
+
+def _noop(name):
+    pass
+
+
+class _StandIn(type):
+    # Hooked classes replace pygame's, but objects made elsewhere (image.load, frombuffer,
+    # transform) are plain pygame instances; isinstance and issubclass defer to the real class
+    def __instancecheck__(cls, obj):
+        return isinstance(obj, cls.__mro__[1])
+
+    def __subclasscheck__(cls, sub):
+        return issubclass(sub, cls.__mro__[1])
+
+
+class Profiler:
+    def __init__(self, enabled=False, out_path=None, window=240):
+        self.enabled, self.out_path, self.window = enabled, out_path, window
+        self.visible = False
+        self.lap = self._lap if enabled else _noop
+        self.frames = 0
+        self.rolling = {s: deque(maxlen=window) for s in SECTIONS + ["frame"]}
+        self.histograms = {s: [0] * (len(BUCKETS_MS) + 1) for s in SECTIONS + ["frame"]}
+        self.totals = {s: 0.0 for s in SECTIONS + ["frame"]}
+        self.counts = {c: 0 for c in COUNTERS}
+        self.rates = {c: [] for c in COUNTERS}
+        self.arrows = deque(maxlen=window)
+        self.rows = [] if out_path else None
+        self._frame = {}
+        self._frame_counts = {c: 0 for c in COUNTERS}
+        self._second_counts = {c: 0 for c in COUNTERS}
+        self._t = self._t_frame = self._t_second = time.perf_counter()
+        self._graph = None
+        self._labels = []
+        self._labels_at = 0
+        self._hooks = []
+        if enabled: self._install_hooks()
+
+    # --- Timing ---
+    def _lap(self, name):
+        t = time.perf_counter()
+        self._frame[name] = self._frame.get(name, 0.0) + (t - self._t) * 1000
+        self._t = t
+
+    def attach(self, *objs):
+        # Objects with a count hook (the voice manager) report what they start
+        for obj in objs:
+            obj.lap = self.lap
+            if self.enabled and hasattr(obj, "count"): obj.count = self._count
+
+    def begin_frame(self):
+        if not self.enabled: return
+        self._t = self._t_frame = time.perf_counter()
+        if not self.frames:
+            # Rates start with the first frame, not with asset loading
+            self._frame_counts, self._second_counts, self._t_second = dict(self.counts), dict(self.counts), self._t
+
+    def end_frame(self, arrows=0):
+        if not self.enabled: return
+        now = time.perf_counter()
+        frame, self._frame = self._frame, {}
+        frame["frame"] = (now - self._t_frame) * 1000
+        for s in SECTIONS + ["frame"]:
+            ms = frame.get(s, 0.0)
+            self.rolling[s].append(ms)
+            self.totals[s] += ms
+            self.histograms[s][bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.arrows.append(arrows)
+        counts = {c: self.counts[c] - self._frame_counts[c] for c in COUNTERS}
+        self._frame_counts = dict(self.counts)
+        if self.rows is not None: self.rows.append([self.frames] + [round(frame.get(s, 0.0), 4) for s in SECTIONS + ["frame"]] + [arrows] + [counts[c] for c in COUNTERS])
+        if now - self._t_second >= 1.0:
+            for c in COUNTERS: self.rates[c].append((self.counts[c] - self._second_counts[c]) / (now - self._t_second))
+            self._second_counts, self._t_second = dict(self.counts), now
+        if self._graph is not None: self._plot(frame)
+        self.frames += 1
+        self._t = time.perf_counter()
+
+    # --- Counting hooks ---
+    def _count(self, name):
+        self.counts[name] += 1
+
+    def _install_hooks(self):
+        prof = self
+
+        class Surface(pygame.Surface, metaclass=_StandIn):
+            def __init__(self, *a, **k):
+                super().__init__(*a, **k); prof._count("surfaces")
+
+        class Font(pygame.font.Font, metaclass=_StandIn):
+            def render(self, *a, **k):
+                prof._count("surfaces"); return super().render(*a, **k)
+
+        class Sound(pygame.mixer.Sound, metaclass=_StandIn):
+            def play(self, *a, **k):
+                prof._count("sounds"); return super().play(*a, **k)
+
+        def counted(fn):
+            def wrapper(*a, **k):
+                prof._count("surfaces"); return fn(*a, **k)
+            return wrapper
+
+        self._hook(pygame, "Surface", Surface)
+        self._hook(pygame.font, "Font", Font)
+        self._hook(pygame.sysfont, "Font", Font)
+        self._hook(pygame.mixer, "Sound", Sound)
+        for name in ("scale", "smoothscale", "scale_by", "rotate", "rotozoom", "flip"):
+            if hasattr(pygame.transform, name): self._hook(pygame.transform, name, counted(getattr(pygame.transform, name)))
+
+    def _hook(self, module, name, value):
+        self._hooks.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+
+    def uninstall(self):
+        for module, name, original in reversed(self._hooks): setattr(module, name, original)
+        self._hooks = []
+
+    # --- On-screen graph ---
+    @property
+    def rect(self):
+        return pygame.Rect(10, 140, GRAPH_SIZE[0] + 10, GRAPH_SIZE[1] + 110)
+
+    def toggle(self):
+        if self.enabled: self.visible = not self.visible
+
+    def _plot(self, frame):
+        # Scroll one pixel and stack this frame's groups as a new column
+        g, (w, h) = self._graph, GRAPH_SIZE
+        g.scroll(-1, 0)
+        g.fill((0, 0, 0, 150), (w - 1, 0, 1, h))
+        y = h
+        for group, colour in GROUPS:
+            ms = sum(v for s, v in frame.items() if s == group or s.startswith(group + "."))
+            px = int(ms * h / GRAPH_MS)
+            if px: g.fill(colour, (w - 1, max(0, y - px), 1, y - max(0, y - px))); y -= px
+            if y <= 0: break
+        g.set_at((w - 1, h - int(16.7 * h / GRAPH_MS)), (255, 255, 255))
+
+    def draw(self, surf, font):
+        if not (self.enabled and self.visible): return
+        saved = dict(self.counts)
+        if self._graph is None:
+            self._graph = pygame.Surface(GRAPH_SIZE, pygame.SRCALPHA); self._graph.fill((0, 0, 0, 150))
+        r = self.rect
+        now = time.perf_counter()
+        if now - self._labels_at > 0.5:
+            self._labels_at = now
+            frame = sorted(self.rolling["frame"]) or [0.0]
+            top = sorted(((sum(self.rolling[s]) / max(1, len(self.rolling[s])), s) for s in SECTIONS), reverse=True)[:4]
+            lines = [f"frame p50 {frame[len(frame) // 2]:.1f}  p99 {frame[min(len(frame) - 1, int(len(frame) * 0.99))]:.1f} ms",
+                     f"arrows {self.arrows[-1] if self.arrows else 0}  surf/s {self.rates['surfaces'][-1] if self.rates['surfaces'] else 0:.0f}  snd/s {self.rates['sounds'][-1] if self.rates['sounds'] else 0:.0f}"]
+            lines += [f"{s} {ms:.2f} ms" for ms, s in top]
+            self._labels = [font.render(l, True, (255, 255, 255)) for l in lines]
+        pygame.draw.rect(surf, (0, 0, 0), r)
+        surf.blit(self._graph, (r.x + 5, r.y + 5))
+        for i, img in enumerate(self._labels): surf.blit(img, (r.x + 5, r.y + GRAPH_SIZE[1] + 8 + i * 16))
+        self.counts = saved
+
+    # --- Dump ---
+    def summary(self):
+        out = {"frames": self.frames, "buckets_ms": BUCKETS_MS, "sections": {}, "counters": {}}
+        for s in SECTIONS + ["frame"]:
+            recent = sorted(self.rolling[s]) or [0.0]
+            out["sections"][s] = {"mean_ms": self.totals[s] / max(1, self.frames), "recent_p50_ms": recent[len(recent) // 2],
+                                  "recent_p99_ms": recent[min(len(recent) - 1, int(len(recent) * 0.99))], "histogram": self.histograms[s]}
+        for c in COUNTERS:
+            rates = self.rates[c] or [0.0]
+            out["counters"][c] = {"total": self.counts[c], "per_second_mean": sum(rates) / len(rates), "per_second_max": max(rates)}
+        out["counters"]["arrows"] = {"mean": sum(self.arrows) / max(1, len(self.arrows)), "max": max(self.arrows, default=0)}
+        return out
+
+    def dump(self, path=None):
+        path = path or self.out_path
+        if not (self.enabled and path): return
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(["frame"] + [s + "_ms" for s in SECTIONS] + ["frame_ms", "arrows"] + [c for c in COUNTERS])
+                w.writerows(self.rows or [])
+        else:
+            with open(path, "w") as f: json.dump(self.summary(), f, indent=1)
@@ -0,0 +1,103 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# --- Projectile Pool ---
+# Struct-of-arrays storage: x, y, velocity, size and template index live in
+# preallocated parallel arrays (NumPy when available, array.array otherwise).
+# Slots [0, n) are live; despawning swaps the last projectile into the hole.
+
+
+class ProjectilePool:
+    def __init__(self, templates, capacity=256, use_numpy=None):
+        # templates: [(img, mask)]; projectiles refer to them by index
+        self.templates = list(templates)
+        self._imgs = [t[0] for t in self.templates]
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        self.n = 0
+        self.capacity = 0
+        self.x = self.y = self.vel = self.w = self.h = self.kind = None
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        n = self.n
+        if self.use_numpy:
+            def resize(old, dtype):
+                new = np.zeros(capacity, dtype)
+                if old is not None: new[:n] = old[:n]
+                return new
+        else:
+            def resize(old, dtype):
+                code = 'd' if dtype is float else 'i'
+                new = array(code, bytes(array(code).itemsize * capacity))
+                if old is not None: new[:n] = old[:n]
+                return new
+        self.x, self.y, self.vel = resize(self.x, float), resize(self.y, float), resize(self.vel, float)
+        self.w, self.h, self.kind = resize(self.w, int), resize(self.h, int), resize(self.kind, int)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.n
+
+    def spawn(self, kind, x, y, vel):
+        if self.n == self.capacity: self._grow(self.capacity * 2)
+        i = self.n
+        w, h = self.templates[kind][0].get_size()
+        self.x[i], self.y[i], self.vel[i], self.w[i], self.h[i], self.kind[i] = x, y, vel, w, h, kind
+        self.n += 1
+
+    def despawn(self, i):
+        last = self.n - 1
+        if i != last:
+            for a in (self.x, self.y, self.vel, self.w, self.h, self.kind): a[i] = a[last]
+        self.n = last
+
+    def clear(self):
+        self.n = 0
+
+    def mask(self, i):
+        return self.templates[self.kind[i]][1]
+
+    # --- Batch operations ---
+    def integrate(self):
+        n = self.n
+        if self.use_numpy: self.y[:n] += self.vel[:n]
+        else:
+            y, vel = self.y, self.vel
+            for i in range(n): y[i] += vel[i]
+
+    def overlapping(self, left, top, right, bottom):
+        # Indices whose bounding box intersects the given world-space rect, ascending
+        n = self.n
+        if self.use_numpy:
+            x, y = self.x[:n], self.y[:n]
+            hit = (x < right) & (x + self.w[:n] > left) & (y < bottom) & (y + self.h[:n] > top)
+            return np.flatnonzero(hit).tolist()
+        x, y, w, h = self.x, self.y, self.w, self.h
+        return [i for i in range(n) if x[i] < right and x[i] + w[i] > left and y[i] < bottom and y[i] + h[i] > top]
+
+    def cull(self, kill_y):
+        # Drops every projectile below kill_y, compacting the survivors in order
+        n = self.n
+        if self.use_numpy:
+            keep = np.flatnonzero(self.y[:n] <= kill_y)
+            if len(keep) == n: return
+            for a in (self.x, self.y, self.vel, self.w, self.h, self.kind): a[:len(keep)] = a[keep]
+            self.n = len(keep)
+        else:
+            y, j = self.y, 0
+            for i in range(n):
+                if y[i] <= kill_y:
+                    if i != j:
+                        for a in (self.x, self.y, self.vel, self.w, self.h, self.kind): a[j] = a[i]
+                    j += 1
+            self.n = j
+
+    def sprites(self, camera_x, alpha=1.0):
+        # (img, screen x, y) for the renderer, y interpolated back towards the previous tick
+        n, imgs, back = self.n, self._imgs, 1.0 - alpha
+        return [(imgs[k], x - camera_x, y - v * back) for k, x, y, v in
+                zip(self.kind[:n].tolist(), self.x[:n].tolist(), self.y[:n].tolist(), self.vel[:n].tolist())]
@@ -0,0 +1,198 @@
+import pygame
+
+# --- Layered Scene Renderer ---
+# Parallax layers are prepared for cheap blits (opaque sky, RLE-encoded sparse
+# layers). While the camera is still, backdrop+background come from a cached
+# composite and only the regions that changed are redrawn and pushed with
+# display.update(rects); anything else falls back to a full redraw + flip.
+# With scale < 1 the scene is drawn into a smaller canvas from layers baked at
+# that size and stretched onto the screen once per frame; callers keep
+# passing screen coordinates and whatever they draw afterwards (HUD,
+# overlays, touch buttons) stays at full resolution.
+
+
+def _rle(surf):
+    # Mostly-transparent layers blit far faster run-length encoded; they are never read back
+    surf = surf.copy()
+    surf.set_alpha(255, pygame.RLEACCEL)
+    return surf
+
+
+def _noop(name):
+    pass
+
+
+def merge_rects(rects):
+    # Overlapping rects are unioned so nothing is blended twice in one frame
+    out = []
+    for r in sorted(rects, key=lambda r: r.x):
+        r = r.copy()
+        i = r.collidelist(out)
+        while i != -1:
+            r.union_ip(out.pop(i))
+            i = r.collidelist(out)
+        out.append(r)
+    return out
+
+
+class SceneRenderer:
+    def __init__(self, screen, backdrop, background, front, level_width, scale=1.0):
+        # Layers and level_width are at the internal size, i.e. already multiplied by scale; level_width
+        # may be fractional (the loop length times scale), the layers' own widths are rounded
+        self.screen = screen
+        self.scale = scale
+        self.canvas = screen if scale == 1 else pygame.Surface((round(screen.get_width() * scale), round(screen.get_height() * scale))).convert()
+        self.bounds = self.canvas.get_rect()
+        self.backdrop = backdrop.convert()
+        self.background = _rle(background)
+        self.front = _rle(front)
+        self.level_width = level_width
+        self.base = pygame.Surface(self.bounds.size).convert()
+        self.base_cam = None
+        self.use_dirty_rects = scale == 1  # a scaled canvas is stretched whole every frame anyway
+        self.full = True
+        self._valid_cam = None
+        self._scene_drawn = False
+        self._prev_rects = []
+        self._marks = []
+        self._watched = {}
+        self.rects = []
+        self._small = {}  # full-size sprite image -> its copy at the internal size
+        self.lap = _noop
+
+    def warm(self):
+        # SDL run-length encodes a layer on its first blit to a given surface; doing that here keeps it out of
+        # the first frame. The canvas is redrawn in full before it is shown.
+        for surf in (self.background, self.front): self.canvas.blit(surf, (0, 0))
+
+    def mark(self, *rects):
+        self._marks.extend(rects)
+
+    def watch(self, key, value, rects):
+        if self._watched.get(key, self) != value:
+            self._watched[key] = value
+            self._marks.extend(rects)
+
+    def _tiles(self, camera_x):
+        # (surface, x) for every visible blit of the scrolling layers, back to front
+        w = self.bounds.width
+        bg_off = camera_x % self.level_width
+        bd_w = self.backdrop.get_width()
+        bd_off = (camera_x * 0.4) % bd_w
+        back = [(self.backdrop, int(i * bd_w - bd_off)) for i in range(2)]
+        bx = int(-bg_off)
+        back += [(self.background, x) for x in (bx, int(bx + self.level_width - 1), int(self.level_width - bg_off))]
+        front = [(self.front, int(i * self.level_width - bg_off)) for i in range(2)]
+        return ([(s, x) for s, x in back if x < w and x + s.get_width() > 0],
+                [(s, x) for s, x in front if x < w and x + s.get_width() > 0])
+
+    def _compose_base(self, camera_x):
+        if self.base_cam != camera_x:
+            for surf, x in self._tiles(camera_x)[0]: self.base.blit(surf, (x, 0))
+            self.base_cam = camera_x
+
+    def _internal(self, img, r):
+        s = self.scale
+        if img is not None:
+            small = self._small.get(img)
+            if small is None: small = self._small[img] = pygame.transform.smoothscale(img, (max(1, round(img.get_width() * s)), max(1, round(img.get_height() * s))))
+            img = small
+        return img, pygame.Rect(round(r.x * s), round(r.y * s), round(r.w * s), round(r.h * s))
+
+    def draw_scene(self, camera_x, sprites, allow_partial=True):
+        # sprites: (img or None, Rect) in draw order; None keeps the rect dirty without drawing
+        screen = self.canvas
+        if self.scale != 1: camera_x, sprites = camera_x * self.scale, [self._internal(img, r) for img, r in sprites]
+        now = [r for _, r in sprites]
+        # Both frames must allow it: an overlay starting this frame (pause, card, vignette) needs the whole screen pushed
+        self.full = not (allow_partial and self.use_dirty_rects and self._valid_cam == camera_x)
+        back, front = self._tiles(camera_x)
+        if self.full:
+            if self.base_cam == camera_x: screen.blit(self.base, (0, 0))
+            else:
+                for surf, x in back: screen.blit(surf, (x, 0))
+            self.rects = [self.bounds]
+        else:
+            self._compose_base(camera_x)
+            self.rects = [r for r in merge_rects(self._marks + self._prev_rects + now) if r.colliderect(self.bounds)]
+            for r in self.rects: screen.blit(self.base, r, r)
+        self.lap("render.parallax")
+        for img, r in sprites:
+            if img is not None: screen.blit(img, r)
+        self.lap("render.sprites")
+        if self.full:
+            for surf, x in front: screen.blit(surf, (x, 0))
+        else:
+            for r in self.rects:
+                for surf, x in front:
+                    area = r.move(-x, 0)
+                    if area.right > 0 and area.x < surf.get_width(): screen.blit(surf, r, area)
+        self.lap("render.parallax")
+        if self.scale != 1:
+            pygame.transform.scale(self.canvas, self.screen.get_size(), self.screen)
+            self.lap("render.upscale")
+        self._prev_rects = now
+        self._marks = []
+        self._scene_drawn = True
+        # A partial frame is only safe if the previous one left a complete scene behind
+        self._valid_cam = camera_x if allow_partial else None
+
+    def present(self):
+        if not self._scene_drawn:
+            self._valid_cam, self._marks, self.full = None, [], True
+        if self.full: pygame.display.flip()
+        else: pygame.display.update(self.rects)
+        self._scene_drawn = False
+
+
+class Hud:
+    # HP seals and the inventory strip are pre-composed and rebuilt only when their inputs change
+    def __init__(self, full_seal, empty_seal, max_hp, icons, screen_width):
+        self.screen_width = screen_width
+        self.seal_pos = (30, 30)
+        self.seals = []
+        for hp in range(max_hp + 1):
+            s = pygame.Surface((max_hp * 70 - 10, 60), pygame.SRCALPHA)
+            for i in range(max_hp): s.blit(full_seal if i < hp else empty_seal, (i * 70, 0))
+            self.seals.append(s)
+        self.icons = icons
+        self.hp = None
+        self.names = None
+        self.inventory = None
+        self.inventory_rect = pygame.Rect(0, 0, 0, 0)
+        self.score_surf = None
+        self.score_rect = pygame.Rect(0, 0, 0, 0)
+
+    def update(self, hp, collected, score_surf):
+        # Returns the screen regions that changed (old and new extents)
+        changed = []
+        if hp != self.hp:
+            self.hp = hp
+            changed.append(pygame.Rect(self.seal_pos, self.seals[0].get_size()))
+        names = tuple(collected)
+        # Click targets are reassigned every frame since pickups replace their entry
+        for i, name in enumerate(names): collected[name]["rect"] = pygame.Rect(self.screen_width - 80 - (i * 90), 20, 60, 80)
+        if names != self.names:
+            self.names = names
+            old = self.inventory_rect
+            left = self.screen_width - 80 - (len(names) - 1) * 90
+            self.inventory_rect = pygame.Rect(left, 20, self.screen_width - 20 - left, 80) if names else pygame.Rect(0, 0, 0, 0)
+            self.inventory = pygame.Surface(self.inventory_rect.size, pygame.SRCALPHA) if names else None
+            for name in names: self.inventory.blit(self.icons[name], (collected[name]["rect"].x - left, 0))
+            changed += [old, self.inventory_rect]
+        if score_surf is not self.score_surf:
+            old = self.score_rect
+            self.score_surf = score_surf
+            self.score_rect = score_surf.get_rect(topright=(self.screen_width - 20, 110))
+            changed += [old, self.score_rect]
+        return [r for r in changed if r.width and r.height]
+
+    @property
+    def rects(self):
+        # Everything draw() blends onto the scene; restored from the base on partial frames
+        return [r for r in (pygame.Rect(self.seal_pos, self.seals[0].get_size()), self.inventory_rect, self.score_rect) if r.width and r.height]
+
+    def draw(self, surf):
+        surf.blit(self.seals[max(0, min(self.hp, len(self.seals) - 1))], self.seal_pos)
+        if self.names: surf.blit(self.inventory, self.inventory_rect)
+        surf.blit(self.score_surf, self.score_rect)
@@ -0,0 +1,203 @@
+import random
+from collections import namedtuple
+
+import pygame
+
+import collision
+from projectiles import ProjectilePool
+
+# --- Fixed-Timestep Simulation ---
+# All gameplay runs in World.step at a fixed TICK_RATE, independent of how
+# often frames are drawn. step() never touches the display, mixer or event
+# queue: it takes an Input and reports what happened as event names, so it
+# can run headless for tests and benchmarks.
+
+TICK_RATE = 60
+DT_MS = 1000 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5
+
+MAX_HP = 4
+START_X, GROUND_Y = 400, 615
+GRAVITY, BASE_JUMP, BASE_SPEED = 0.8, -16, 8
+CAMERA_LEAD = 400
+
+Input = namedtuple("Input", "right left jump jump_tap")
+IDLE_INPUT = Input(False, False, False, False)
+
+
+def _noop(name):
+    pass
+
+
+# --- Difficulty ramps (per loop) ---
+def run_speed(loop):
+    return BASE_SPEED + loop * 0.4
+
+
+def spawn_delay_range(loop):
+    # ms between arrows, drawn uniformly from [low, high]
+    return max(150, 700 - loop * 80), max(350, 1100 - loop * 60)
+
+
+def arrow_speed(loop):
+    # Base fall speed; each arrow adds uniform(-1.0, 2.5)
+    return 7 + loop * 1.2
+
+
+class Level:
+    # Everything the simulation needs from the loaded assets
+    def __init__(self, level_width, view_size, platforms, idle_anim, run_anim, arrow_templates, pickups):
+        self.level_width = level_width
+        self.view_w, self.view_h = view_size
+        self.platforms = platforms
+        self.idle_anim, self.run_anim = idle_anim, run_anim
+        self.arrow_templates = arrow_templates
+        self.pickups = pickups
+
+
+class World:
+    def __init__(self, level, seed=None):
+        self.level = level
+        self.rng = random.Random(seed)
+        self.arrows = ProjectilePool([(a["img"], a["mask"]) for a in level.arrow_templates])
+        self.pickups = [dict(p) for p in level.pickups]
+        self.pickup_index = collision.PickupIndex(self.pickups)
+        self.lap = _noop  # Profiler.attach swaps in a timer for the phases below
+        self.reset()
+
+    def reset(self):
+        self.hp = MAX_HP
+        self.player_x, self.player_y = START_X, GROUND_Y
+        self.prev_x, self.prev_y, self.prev_camera_x = START_X, GROUND_Y, 0
+        self.vel_y, self.camera_x = 0, 0
+        self.player_direction, self.jumps_left, self.jump_pressed = 1, 2, False
+        self.is_moving, self.is_grounded = False, True
+        self.anim_idx, self.anim_timer, self.invuln_timer = 0, 0, 0
+        self.loop_count, self.total_score = 0, 0
+        self.collected = {}
+        self.time_ms, self.last_spawn_time, self.heartbeat_timer = 0, 0, 0
+        self.ticks = 0
+        self.over, self.fell = False, False
+        self.arrows.clear()
+        for p in self.pickups: p["active"] = True
+
+    @property
+    def anim(self):
+        return self.level.run_anim if self.is_moving else self.level.idle_anim
+
+    def _jump(self, events):
+        self.vel_y = BASE_JUMP; self.jumps_left -= 1; self.is_grounded = False
+        events.append("jump")
+
+    def step(self, inp):
+        # Advances one fixed tick; returns the sounds/transitions it triggered
+        lv, rng, events, lap = self.level, self.rng, [], self.lap
+        lap("logic")
+        self.ticks += 1
+        self.time_ms += DT_MS
+        self.prev_x, self.prev_y, self.prev_camera_x = self.player_x, self.player_y, self.camera_x
+
+        if inp.jump_tap and self.jumps_left > 0: self._jump(events)
+
+        current_speed = run_speed(self.loop_count)
+        if self.invuln_timer > 0: self.invuln_timer -= 1
+        if self.hp == 1 and self.time_ms - self.heartbeat_timer > 600:
+            events.append("heartbeat"); self.heartbeat_timer = self.time_ms
+
+        self.is_moving = False
+        if inp.right:
+            self.player_x += current_speed; self.player_direction = 1; self.is_moving = True
+        if inp.left and self.player_x > self.camera_x:
+            self.player_x -= current_speed; self.player_direction = -1; self.is_moving = True
+
+        if inp.jump and not self.jump_pressed and self.jumps_left > 0:
+            self._jump(events); self.jump_pressed = True
+        if not inp.jump: self.jump_pressed = False
+
+        prev_y = self.player_y
+        self.vel_y += GRAVITY; self.player_y += self.vel_y
+        self.camera_x = max(0, self.player_x - CAMERA_LEAD)
+        lap("logic.move")
+
+        self.is_grounded = False
+        land_y = lv.platforms.land(int(self.player_x % lv.level_width), prev_y, self.player_y) if self.vel_y > 0 else None
+        if (self.player_y >= GROUND_Y) or land_y is not None:
+            self.player_y = GROUND_Y if self.player_y >= GROUND_Y else land_y
+            self.vel_y, self.jumps_left, self.is_grounded = 0, 2, True
+        lap("logic.ground")
+
+        self.anim_timer += 0.15
+        current_set = self.anim
+        if self.is_moving: self.anim_timer += 0.08
+        if self.anim_timer >= 1:
+            self.anim_idx = (self.anim_idx + 1) % len(current_set)
+            self.anim_timer = 0
+        _, mask, p_rect = current_set.pose(self.anim_idx, self.player_direction, self.player_x - self.camera_x, self.player_y)
+        lap("logic.anim")
+
+        spawn_delay = rng.randint(*spawn_delay_range(self.loop_count))
+        if self.time_ms - self.last_spawn_time > spawn_delay and lv.arrow_templates:
+            kind = rng.randrange(len(lv.arrow_templates))
+            tx = rng.randint(int(self.camera_x) + 50, int(self.camera_x) + lv.view_w - 50)
+            self.arrows.spawn(kind, tx, -100, arrow_speed(self.loop_count) + rng.uniform(-1.0, 2.5))
+            events.append("whoosh"); self.last_spawn_time = self.time_ms
+        lap("logic.spawn")
+
+        if collision.step_arrows(self.arrows, mask, p_rect, self.camera_x, lv.view_h) and self.invuln_timer <= 0:
+            self.hp -= 1; events.append("hit"); self.invuln_timer = 60
+        lap("logic.arrows")
+
+        for p in collision.collide_pickups(self.pickup_index, mask, p_rect, self.loop_count * lv.level_width - self.camera_x):
+            p["active"] = False; events.append("pickup")
+            self.collected[p["name"]] = {"rect": pygame.Rect(0,0,0,0)}
+            self.total_score += 500 * (self.loop_count + 1)
+        lap("logic.pickups")
+
+        if self.player_x > (self.loop_count + 1) * lv.level_width:
+            self.loop_count += 1; events.append("loop")
+            for p in self.pickups: p["active"] = True
+
+        if self.hp <= 0 or self.player_y > lv.view_h + 100:
+            self.over, self.fell = True, self.player_y > lv.view_h
+            events.append("gameover")
+        return events
+
+    def snapshot(self):
+        # Everything step() reads or writes, as plain values; replays hash it to prove they match
+        a, n = self.arrows, self.arrows.n
+        return (self.ticks, self.time_ms, self.hp, self.player_x, self.player_y, self.vel_y, self.camera_x,
+                self.player_direction, self.jumps_left, self.jump_pressed, self.is_grounded, self.is_moving,
+                self.anim_idx, self.anim_timer, self.invuln_timer, self.loop_count, self.total_score,
+                self.last_spawn_time, self.heartbeat_timer, self.over, tuple(self.collected),
+                tuple(p["active"] for p in self.pickups),
+                a.kind[:n].tolist(), a.x[:n].tolist(), a.y[:n].tolist(), a.vel[:n].tolist())
+
+    # --- Interpolated view for rendering between ticks ---
+    def view(self, alpha):
+        # (player_x, player_y, camera_x) blended between the last two ticks
+        lerp = lambda a, b: a + (b - a) * alpha
+        return lerp(self.prev_x, self.player_x), lerp(self.prev_y, self.player_y), lerp(self.prev_camera_x, self.camera_x)
+
+
+class FixedStep:
+    # Accumulates real frame time and says how many ticks to run and how far into the next one we are
+    def __init__(self, tick_ms=DT_MS, max_ticks=MAX_TICKS_PER_FRAME):
+        self.tick_ms, self.max_ticks = tick_ms, max_ticks
+        self.acc = 0.0
+
+    def advance(self, frame_ms):
+        self.acc += frame_ms
+        ticks = int(self.acc // self.tick_ms)
+        if ticks > self.max_ticks:
+            # Too far behind (slow device, debugger): drop the backlog instead of spiralling
+            ticks, self.acc = self.max_ticks, 0.0
+        else:
+            self.acc -= ticks * self.tick_ms
+        return ticks
+
+    @property
+    def alpha(self):
+        return self.acc / self.tick_ms
+
+    def reset(self):
+        self.acc = 0.0
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import re
+import struct
+from array import array
+
+import pygame
+
+# --- Platform Heightmap ---
+# The floating-platform layer is reduced once to solid vertical spans per
+# column (CSR layout: offsets[x]..offsets[x+1] index into tops/bottoms), so
+# grounding is a sweep over a handful of ints instead of Surface.get_at.
+
+CACHE_DIR = os.path.join("cache", "terrain")
+MAGIC = b"RSHM1"
+_SOLID = bytes([0] + [1] * 255)
+
+
+class Heightmap:
+    def __init__(self, width, height, offsets, tops, bottoms):
+        self.width, self.height = width, height
+        self.offsets, self.tops, self.bottoms = offsets, tops, bottoms
+
+    @classmethod
+    def from_surface(cls, surf):
+        # Any pixel with alpha > 0 is solid, as with the old get_at test
+        w, h = surf.get_size()
+        # Rotating 90 degrees turns column x into row w-1-x, so each column is one contiguous byte run
+        alpha = pygame.image.tobytes(pygame.transform.rotate(surf, 90), "RGBA")[3::4].translate(_SOLID)
+        offsets, tops, bottoms = array('i', [0]), array('h'), array('h')
+        for x in range(w):
+            row = (w - 1 - x) * h
+            for m in re.finditer(b"\x01+", alpha[row:row + h]):
+                tops.append(m.start()); bottoms.append(m.end())
+            offsets.append(len(tops))
+        return cls(w, h, offsets, tops, bottoms)
+
+    def spans(self, x):
+        return [(self.tops[i], self.bottoms[i]) for i in range(self.offsets[x], self.offsets[x + 1])]
+
+    def solid(self, x, y):
+        return 0 <= x < self.width and any(top <= y < bottom for top, bottom in self.spans(x))
+
+    def land(self, x, prev_y, y):
+        # Landing height when falling from prev_y to y through column x, else None.
+        # Crossing a top edge snaps onto it; starting inside a platform lands where we are.
+        if not 0 <= x < self.width: return None
+        tops, bottoms = self.tops, self.bottoms
+        for i in range(self.offsets[x], self.offsets[x + 1]):
+            top, bottom = tops[i], bottoms[i]
+            if top > y: break
+            if bottom > prev_y: return top if top > prev_y else int(y)
+        return None
+
+    # --- Disk cache ---
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("<iii", self.width, self.height, len(self.tops)))
+            self.offsets.tofile(f); self.tops.tofile(f); self.bottoms.tofile(f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC: raise ValueError(f"{path}: not a heightmap")
+            w, h, n = struct.unpack("<iii", f.read(12))
+            offsets, tops, bottoms = array('i'), array('h'), array('h')
+            offsets.fromfile(f, w + 1); tops.fromfile(f, n); bottoms.fromfile(f, n)
+        return cls(w, h, offsets, tops, bottoms)
+
+
+def load_heightmap(surf, source_path):
+    # Cached per source image contents and scaled size; rebuilt if missing or stale
+    try:
+        with open(source_path, "rb") as f: digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    except OSError:
+        return Heightmap.from_surface(surf)
+    w, h = surf.get_size()
+    path = os.path.join(CACHE_DIR, f"{os.path.splitext(os.path.basename(source_path))[0]}_{w}x{h}_{digest}.bin")
+    try:
+        return Heightmap.load(path)
+    except (OSError, ValueError, EOFError, struct.error):
+        pass
+    hm = Heightmap.from_surface(surf)
+    try: hm.save(path)
+    except OSError: pass
+    return hm
@@ -0,0 +1,66 @@
+import pygame
+
+# --- SFX Voice Manager ---
+# Sound effects play on a fixed set of reserved mixer channels, so the music
+# keeps the unreserved ones and the mixer never mixes more than VOICES
+# effects at once. Triggers are queued during a frame and started together
+# by flush(): repeats of a sound within one frame collapse into one voice.
+# A sound at its cap restarts its own oldest voice; with every channel
+# busy a trigger takes the oldest voice of the lowest lower-priority sound,
+# or is dropped if there is none.
+
+VOICES = 6
+MUSIC_CHANNELS = 2  # the theme crossfades between two Sounds
+PRIORITIES = {  # kind: (priority, max voices); higher priorities steal from lower ones
+    "gameover": (3, 1), "highscore": (3, 1), "pitfall": (3, 1), "hit": (3, 1),
+    "heartbeat": (2, 1), "pickup": (2, 2), "click": (2, 1),
+    "jump": (1, 1), "whoosh": (0, 2),
+}
+DEFAULT_PRIORITY = (1, 1)
+
+
+def _noop(name):
+    pass
+
+
+class VoiceManager:
+    def __init__(self, sounds, voices=VOICES, priorities=PRIORITIES):
+        self.sounds = sounds
+        self.priorities = priorities
+        pygame.mixer.set_num_channels(voices + MUSIC_CHANNELS)
+        pygame.mixer.set_reserved(voices)
+        self.channels = [pygame.mixer.Channel(i) for i in range(voices)]
+        self._kinds = [None] * voices   # what each channel last started
+        self._started = [0] * voices    # when, as a running trigger number
+        self._pending = []
+        self.triggers = self.merged = self.started = self.stolen = self.dropped = 0
+        self.count = _noop  # profiler hook, called once per started voice
+
+    def play(self, kind):
+        self.triggers += 1
+        if kind in self._pending: self.merged += 1
+        else: self._pending.append(kind)
+
+    def flush(self):
+        if not self._pending: return
+        pending, self._pending = self._pending, []
+        # Most important first, so a lower-priority trigger this frame can't take the last channel
+        for kind in sorted(pending, key=lambda k: -self.priorities.get(k, DEFAULT_PRIORITY)[0]): self._start(kind)
+
+    def _start(self, kind):
+        priority, cap = self.priorities.get(kind, DEFAULT_PRIORITY)
+        busy = [i for i, ch in enumerate(self.channels) if ch.get_busy()]
+        own = [i for i in busy if self._kinds[i] == kind]
+        if len(own) >= cap:
+            i = min(own, key=self._started.__getitem__); self.stolen += 1
+        else:
+            free = [i for i in range(len(self.channels)) if i not in busy]
+            if free: i = free[0]
+            else:
+                lower = [i for i in busy if self.priorities.get(self._kinds[i], DEFAULT_PRIORITY)[0] < priority]
+                if not lower: self.dropped += 1; return
+                i = min(lower, key=lambda i: (self.priorities.get(self._kinds[i], DEFAULT_PRIORITY)[0], self._started[i])); self.stolen += 1
+        self.channels[i].play(self.sounds[kind])
+        self._kinds[i] = kind
+        self.started += 1; self._started[i] = self.started
+        self.count("sounds")